@@ -1,9 +1,50 @@
 """CloudWise Backend Application"""
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# How often the AWS credentials are re-checked with STS
+CREDENTIAL_CHECK_INTERVAL = 15 * 60
+
+async def _check_aws_credentials(app: FastAPI, aws_client):
+    """Re-verify the AWS credentials periodically, recording the last result"""
+    while True:
+        try:
+            app.state.aws_identity = await asyncio.to_thread(aws_client.verify_credentials)
+            app.state.aws_identity_error = None
+        except Exception as e:
+            app.state.aws_identity_error = str(e)
+            logger.warning("AWS credential check failed: %s", e)
+        await asyncio.sleep(CREDENTIAL_CHECK_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.regions = None
+    app.state.aws_identity = None
+    app.state.aws_identity_error = None
+    credential_check = None
+    try:
+        from app.cloud_providers.clients import get_aws_client
+        aws_client = await asyncio.to_thread(get_aws_client)
+        # Validate credentials now and every CREDENTIAL_CHECK_INTERVAL after
+        credential_check = asyncio.create_task(_check_aws_credentials(app, aws_client))
+        # Discover AWS regions once at startup so EC2 listings skip describe_regions
+        app.state.regions = await asyncio.to_thread(aws_client._get_all_regions)
+    except Exception as e:
+        logger.warning("Skipping AWS startup checks: %s", e)
+    yield
+    if credential_check:
+        credential_check.cancel()
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+    # Cost and metrics payloads are large nested dicts; orjson serializes them
+    # considerably faster than the stdlib json encoder
+    app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
     
     from app.api.routes.query import router as query_router
     app.include_router(query_router)
@@ -16,4 +57,12 @@ def create_app() -> FastAPI:
     def health_check():
         return {"status": "healthy"}
     
+    @app.get("/healthz")
+    def healthz():
+        return {
+            "status": "healthy",
+            "aws_identity": app.state.aws_identity,
+            "aws_identity_error": app.state.aws_identity_error
+        }
+    
     return app
@@ -1,72 +1,85 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional, List
-from ..cloud_providers.aws_client import AWSClient
-from ..cloud_providers.azure_client import AzureClient
-from ..services.llm_service import LLMService
-from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Any, Optional, List
+from ..cloud_providers.clients import get_aws_client, get_azure_client
+from ..services.date_windows import date_window
+from ..services.cost_cache import get_or_fetch
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+import asyncio
 import os
 
-# Initialize services with optional cloud clients
-aws_client = None
-azure_client = None
-llm_service = None
+# The SDK-backed classes are imported lazily by the providers below so that
+# importing this module doesn't pull in boto3, azure-mgmt or openai.
+if TYPE_CHECKING:
+    from ..cloud_providers.aws_client import AWSClient
+    from ..cloud_providers.azure_client import AzureClient
+    from ..services.llm_service import LLMService
 
-def init_services():
-    """Initialize services if environment variables are available"""
-    global aws_client, azure_client, llm_service
-    
-    # Initialize AWS client if credentials are available
-    if os.getenv('AWS_ACCESS_KEY_ID') and os.getenv('AWS_SECRET_ACCESS_KEY'):
-        try:
-            aws_client = AWSClient(
-                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                region=os.getenv('AWS_REGION', 'us-west-2')
-            )
-            print("AWS client initialized successfully")
-        except Exception as e:
-            print(f"Failed to initialize AWS client: {str(e)}")
-            aws_client = None
-    
-    # Initialize Azure client if all Azure credentials are available
+# Services are built lazily on first use and cached for the worker's lifetime.
+# Each provider returns None when the platform isn't configured.
+
+@lru_cache(maxsize=1)
+def get_optional_aws_client() -> Optional["AWSClient"]:
+    """Dependency returning the shared AWS client if credentials are available"""
+    env = os.environ
+    if not (env.get('AWS_ACCESS_KEY_ID') and env.get('AWS_SECRET_ACCESS_KEY')):
+        return None
+    try:
+        aws_client = get_aws_client()
+        print("AWS client initialized successfully")
+        return aws_client
+    except Exception as e:
+        print(f"Failed to initialize AWS client: {str(e)}")
+        return None
+
+@lru_cache(maxsize=1)
+def get_optional_azure_client() -> Optional["AzureClient"]:
+    """Dependency returning the shared Azure client if all credentials are available"""
     required_azure_vars = [
         'AZURE_SUBSCRIPTION_ID',
         'AZURE_TENANT_ID',
         'AZURE_CLIENT_ID',
         'AZURE_CLIENT_SECRET'
     ]
+    # Snapshot the variables once and reuse them for the diagnostics below
+    env = os.environ
+    azure_present = {var: env.get(var) for var in required_azure_vars}
     
-    if all(os.getenv(var) for var in required_azure_vars):
-        try:
-            azure_client = AzureClient(
-                subscription_id=os.getenv('AZURE_SUBSCRIPTION_ID')
-            )
-            print("Azure client initialized successfully")
-        except Exception as e:
-            print(f"Failed to initialize Azure client: {str(e)}")
-            print("Azure credentials found:")
-            for var in required_azure_vars:
-                print(f"{var}: {'Present' if os.getenv(var) else 'Missing'}")
-            azure_client = None
-    else:
+    if not all(azure_present.values()):
         print("Missing required Azure credentials:")
-        for var in required_azure_vars:
-            print(f"{var}: {'Present' if os.getenv(var) else 'Missing'}")
-    
-    # Initialize LLM service if API key is available
-    if os.getenv('OPENAI_API_KEY'):
-        try:
-            llm_service = LLMService(
-                api_key=os.getenv('OPENAI_API_KEY')
-            )
-            print("LLM service initialized successfully")
-        except Exception as e:
-            print(f"Failed to initialize LLM service: {str(e)}")
-            llm_service = None
+        for var, value in azure_present.items():
+            print(f"{var}: {'Present' if value else 'Missing'}")
+        return None
 
-# Try to initialize services
-init_services()
+    try:
+        azure_client = get_azure_client()
+        print("Azure client initialized successfully")
+        return azure_client
+    except Exception as e:
+        print(f"Failed to initialize Azure client: {str(e)}")
+        print("Azure credentials found:")
+        for var, value in azure_present.items():
+            print(f"{var}: {'Present' if value else 'Missing'}")
+        return None
+
+@lru_cache(maxsize=1)
+def get_llm_service() -> Optional["LLMService"]:
+    """Dependency returning the shared LLM service if an API key is available"""
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if not api_key:
+        return None
+    try:
+        from ..services.llm_service import LLMService
+        llm_service = LLMService(
+            api_key=api_key
+        )
+        print("LLM service initialized successfully")
+        return llm_service
+    except Exception as e:
+        print(f"Failed to initialize LLM service: {str(e)}")
+        return None
 
 # Create API router
 router = APIRouter()
@@ -85,12 +98,13 @@ class ErrorAnalysisRequest(BaseModel):
 class CostOptimizationRequest(BaseModel):
     platform: str = Field("all", description="Platform to analyze (aws/azure/all)")
 
-class CloudCommandResponse(BaseModel):
-    command_interpreted: Dict[str, Any]
-    results: Dict[str, Any]
-
-@router.post("/query", response_model=CloudCommandResponse)
-async def process_query(request: QueryRequest):
+@router.post("/query")
+async def process_query(
+    request: QueryRequest,
+    llm_service=Depends(get_llm_service),
+    aws_client=Depends(get_optional_aws_client),
+    azure_client=Depends(get_optional_azure_client)
+):
     """Process a natural language cloud management query"""
     try:
         if not llm_service:
@@ -114,121 +128,192 @@ async def process_query(request: QueryRequest):
         )
 
         # Execute the interpreted command
-        response = await execute_cloud_command(result)
+        response = await execute_cloud_command(result, aws_client, azure_client, llm_service)
         return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-async def execute_cloud_command(command: Dict[str, Any]) -> Dict[str, Any]:
+# Dedicated pool for blocking cloud SDK calls, so a burst of slow AWS/Azure
+# requests can't starve the event loop's default executor
+_cloud_io_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='cloud-io')
+
+async def _run_blocking(func, *args, **kwargs):
+    """Run a blocking cloud SDK call on the cloud I/O thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_cloud_io_executor, partial(func, *args, **kwargs))
+
+async def _azure_vm(azure_client: "AzureClient", params: Dict[str, Any]):
+    region_vms = await azure_client.list_virtual_machines_async(resource_group=params.get('resource_group'))
+    return 'azure_vm', {
+        'regions': region_vms,
+        'total_vms': sum(len(vms) for vms in region_vms.values())
+    }
+
+async def _azure_vm_status(azure_client: "AzureClient", params: Dict[str, Any]):
+    # Several VMs in one resource group are fetched together as ARM batches
+    if params.get('vm_names'):
+        statuses = await azure_client.get_vm_statuses_async(
+            [(params['resource_group'], vm_name) for vm_name in params['vm_names']]
+        )
+        return 'azure_vm_status', dict(zip(params['vm_names'], statuses))
+    return 'azure_vm_status', await _run_blocking(
+        azure_client.get_vm_status,
+        resource_group=params['resource_group'],
+        vm_name=params['vm_name']
+    )
+
+async def _azure_storage(azure_client: "AzureClient", params: Dict[str, Any]):
+    region_accounts = await _run_blocking(azure_client.list_storage_accounts)
+    return 'azure_storage', {
+        'regions': region_accounts,
+        'total_accounts': sum(len(accounts) for accounts in region_accounts.values())
+    }
+
+async def _azure_cost(azure_client: "AzureClient", params: Dict[str, Any]):
+    timeframe = params.get('timeframe', 'LastMonth')
+    return 'azure_costs', await _run_blocking(
+        get_or_fetch,
+        ('azure', azure_client.subscription_id, timeframe, date.today().isoformat()),
+        partial(azure_client.get_cost_analysis, timeframe)
+    )
+
+async def _azure_groups(azure_client: "AzureClient", params: Dict[str, Any]):
+    return 'azure_groups', await _run_blocking(azure_client.list_resource_groups)
+
+async def _aws_ec2(aws_client: "AWSClient", params: Dict[str, Any]):
+    region_instances = await aws_client.list_ec2_instances_async(filters=params.get('filters'))
+    return 'aws_ec2', {
+        'regions': region_instances,
+        'total_instances': sum(len(instances) for instances in region_instances.values())
+    }
+
+async def _aws_s3(aws_client: "AWSClient", params: Dict[str, Any]):
+    region_buckets = await _run_blocking(aws_client.list_s3_buckets)
+    # Aggregate all totals in a single pass over the buckets
+    total_buckets = total_size = total_objects = 0
+    for buckets in region_buckets.values():
+        total_buckets += len(buckets)
+        for b in buckets:
+            total_size += b['Size']
+            total_objects += b['ObjectCount']
+    return 'aws_s3', {
+        'regions': region_buckets,
+        'total_buckets': total_buckets,
+        'total_size': total_size,
+        'total_objects': total_objects
+    }
+
+async def _aws_cost(aws_client: "AWSClient", params: Dict[str, Any]):
+    start_date, end_date = date_window(30)
+    return 'aws_costs', await _run_blocking(
+        get_or_fetch,
+        ('aws', start_date, end_date),
+        partial(aws_client.get_cost_and_usage, start_date, end_date)
+    )
+
+# Resource type -> (action keyword, handler) pairs, tried in order.
+# A keyword of None matches any action.
+AZURE_HANDLERS = {
+    'VM': (('list', _azure_vm), ('status', _azure_vm_status)),
+    'Storage': (('list', _azure_storage),),
+    'cost': ((None, _azure_cost),),
+    'costs': ((None, _azure_cost),),
+    'ResourceGroup': (('list', _azure_groups),)
+}
+
+AWS_HANDLERS = {
+    'EC2': (('list', _aws_ec2),),
+    'S3': (('list', _aws_s3),),
+    'cost': ((None, _aws_cost),),
+    'costs': ((None, _aws_cost),)
+}
+
+def _select_handler(handlers, resource: str, action: str):
+    """Return the handler for a resource/action pair, or None if unsupported"""
+    for keyword, handler in handlers.get(resource, ()):
+        if keyword is None or keyword in action:
+            return handler
+    return None
+
+def _plan_cloud_command(
+    command: Dict[str, Any],
+    aws_client: Optional["AWSClient"],
+    azure_client: Optional["AzureClient"]
+):
+    """Resolve a command into (platform, coroutine) tasks plus any setup errors"""
+    errors = {}
+    tasks = []
+    action = command['action'].lower()
+    platforms = set(command['platforms'])
+    resources = command['resources']
+    params = command['parameters']
+    
+    for platform, (key, client, handlers) in {
+        'Azure': ('azure', azure_client, AZURE_HANDLERS),
+        'AWS': ('aws', aws_client, AWS_HANDLERS)
+    }.items():
+        if platform not in platforms:
+            continue
+        if not client:
+            errors[f'{key}_error'] = f'{platform} client not initialized. Please check {platform} credentials.'
+            continue
+        # Process each requested resource type
+        for resource in resources:
+            handler = _select_handler(handlers, resource, action)
+            if handler:
+                tasks.append((key, handler(client, params)))
+    return errors, tasks
+
+def _task_error(platform: str, error: Exception):
+    label = 'Azure' if platform == 'azure' else 'AWS'
+    return f'{platform}_error', f'Error executing {label} command: {str(error)}'
+
+async def execute_cloud_command(
+    command: Dict[str, Any],
+    aws_client: Optional["AWSClient"],
+    azure_client: Optional["AzureClient"],
+    llm_service: Optional["LLMService"]
+) -> Dict[str, Any]:
     """Execute the interpreted cloud command"""
-    try:
-        responses = {}
-        service_status = {
-            'aws': aws_client is not None,
-            'azure': azure_client is not None,
-            'llm': llm_service is not None
+    available_services = {
+        'aws': aws_client is not None,
+        'azure': azure_client is not None,
+        'llm': llm_service is not None
+    }
+    # Bail out before planning any work if none of the requested platforms is usable
+    requested = set(command.get('platforms', ()))
+    if ('AWS' not in requested or not aws_client) and ('Azure' not in requested or not azure_client):
+        return {
+            'status': 'error',
+            'message': 'No cloud client is available for the requested platforms. Please check your credentials.',
+            'command_interpreted': command,
+            'available_services': available_services
         }
-        
-        # Handle Azure operations
-        if 'Azure' in command['platforms']:
-            if not azure_client:
-                responses['azure_error'] = 'Azure client not initialized. Please check Azure credentials.'
-            else:
-                try:
-                    # Process each requested resource type
-                    for resource in command['resources']:
-                        if resource == 'VM':
-                            if 'list' in command['action'].lower():
-                                region_vms = azure_client.list_virtual_machines(
-                                    resource_group=command['parameters'].get('resource_group')
-                                )
-                                responses['azure_vm'] = {
-                                    'regions': region_vms,
-                                    'total_vms': sum(len(vms) for vms in region_vms.values())
-                                }
-                        
-                        elif resource == 'Storage':
-                            if 'list' in command['action'].lower():
-                                region_accounts = azure_client.list_storage_accounts()
-                                responses['azure_storage'] = {
-                                    'regions': region_accounts,
-                                    'total_accounts': sum(len(accounts) for accounts in region_accounts.values())
-                                }
-                        
-                        elif resource in ['cost', 'costs']:
-                            timeframe = command['parameters'].get('timeframe', 'LastMonth')
-                            responses['azure_costs'] = azure_client.get_cost_analysis(timeframe)
-                except Exception as e:
-                    responses['azure_error'] = f'Error executing Azure command: {str(e)}'
-        
-        # Handle AWS operations
-        if 'AWS' in command['platforms']:
-            if not aws_client:
-                responses['aws_error'] = 'AWS client not initialized. Please check AWS credentials.'
-            else:
-                try:
-                    # Process each requested resource type
-                    for resource in command['resources']:
-                        if resource == 'EC2':
-                            if 'list' in command['action'].lower():
-                                region_instances = aws_client.list_ec2_instances(
-                                    filters=command['parameters'].get('filters')
-                                )
-                                responses['aws_ec2'] = {
-                                    'regions': region_instances,
-                                    'total_instances': sum(len(instances) for instances in region_instances.values())
-                                }
-                        
-                        elif resource == 'S3':
-                            if 'list' in command['action'].lower():
-                                region_buckets = aws_client.list_s3_buckets()
-                                responses['aws_s3'] = {
-                                    'regions': region_buckets,
-                                    'total_buckets': sum(len(buckets) for buckets in region_buckets.values()),
-                                    'total_size': sum(sum(b['Size'] for b in buckets) for buckets in region_buckets.values()),
-                                    'total_objects': sum(sum(b['ObjectCount'] for b in buckets) for buckets in region_buckets.values())
-                                }
-                        
-                        elif resource in ['cost', 'costs']:
-                            end_date = datetime.now().strftime('%Y-%m-%d')
-                            start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-                            responses['aws_costs'] = aws_client.get_cost_and_usage(start_date, end_date)
-                except Exception as e:
-                    responses['aws_error'] = f'Error executing AWS command: {str(e)}'
-
-        # Handle Azure operations
-        if 'Azure' in command['platforms']:
-            if not azure_client:
-                responses['azure_error'] = 'Azure client not initialized. Please check Azure credentials.'
-            else:
-                if 'VM' in command['resources']:
-                    if 'list' in command['action'].lower():
-                        responses['azure_vms'] = azure_client.list_virtual_machines(
-                            resource_group=command['parameters'].get('resource_group')
-                        )
-                    elif 'status' in command['action'].lower():
-                        responses['azure_vm_status'] = azure_client.get_vm_status(
-                            resource_group=command['parameters']['resource_group'],
-                            vm_name=command['parameters']['vm_name']
-                        )
-                elif 'ResourceGroup' in command['resources']:
-                    if 'list' in command['action'].lower():
-                        responses['azure_groups'] = azure_client.list_resource_groups()
+
+    try:
+        responses, tasks = _plan_cloud_command(command, aws_client, azure_client)
+
+        # Run every resource fetch across both clouds at once
+        results = await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+        for (platform, _), result in zip(tasks, results):
+            if isinstance(result, Exception):
+                result = _task_error(platform, result)
+            key, value = result
+            responses[key] = value
 
         return {
             'command_interpreted': command,
             'results': responses,
-            'available_services': {
-                'aws': aws_client is not None,
-                'azure': azure_client is not None,
-                'llm': llm_service is not None
-            }
+            'available_services': available_services
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/analyze-error")
-async def analyze_error(request: ErrorAnalysisRequest):
+async def analyze_error(
+    request: ErrorAnalysisRequest,
+    llm_service=Depends(get_llm_service)
+):
     """Analyze a cloud operation error"""
     try:
         analysis = llm_service.analyze_error(
@@ -242,31 +327,59 @@ async def analyze_error(request: ErrorAnalysisRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/optimize-costs")
-async def optimize_costs(request: CostOptimizationRequest):
+async def optimize_costs(
+    request: CostOptimizationRequest,
+    llm_service=Depends(get_llm_service),
+    aws_client=Depends(get_optional_aws_client),
+    azure_client=Depends(get_optional_azure_client)
+):
     """Get cost optimization recommendations"""
     try:
         platform = request.platform.lower()
         resource_details = {}
         cost_data = {}
+        tasks = {}
         
-        # Gather resource and cost data
-        if platform in ['all', 'aws']:
-            end_date = datetime.now().strftime('%Y-%m-%d')
-            start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        # Gather resource and cost data concurrently
+        if platform in ('all', 'aws') and aws_client is not None:
+            start_date, end_date = date_window(30)
             
-            resource_details['aws_ec2'] = aws_client.list_ec2_instances()
-            resource_details['aws_s3'] = aws_client.list_s3_buckets()
-            cost_data['aws'] = aws_client.get_cost_and_usage(start_date, end_date)
+            tasks['aws_ec2'] = aws_client.list_ec2_instances_async()
+            tasks['aws_s3'] = _run_blocking(aws_client.list_s3_buckets)
+            tasks['aws_cost'] = _run_blocking(
+                get_or_fetch,
+                ('aws', start_date, end_date),
+                partial(aws_client.get_cost_and_usage, start_date, end_date)
+            )
             
-        if platform in ['all', 'azure']:
-            resource_details['azure_vms'] = azure_client.list_virtual_machines()
-            resource_details['azure_groups'] = azure_client.list_resource_groups()
+        if platform in ('all', 'azure') and azure_client is not None:
+            tasks['azure_vms'] = azure_client.list_virtual_machines_async()
+            tasks['azure_groups'] = _run_blocking(azure_client.list_resource_groups)
 
-        recommendations = llm_service.get_cost_optimization(
-            resource_details=resource_details,
-            cost_data=cost_data
+        if not tasks:
+            raise HTTPException(
+                status_code=503,
+                detail=f'No cloud client is available for platform "{request.platform}". Please check your credentials.'
+            )
+
+        done = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for key, result in zip(tasks, done):
+            if isinstance(result, Exception):
+                raise result
+            if key == 'aws_cost':
+                cost_data['aws'] = result
+            else:
+                resource_details[key] = result
+
+        if llm_service is None:
+            raise HTTPException(status_code=503, detail='LLM service not initialized. Please check OPENAI_API_KEY.')
+
+        # The recommendation call is a blocking LLM round trip too
+        return await _run_blocking(
+            llm_service.optimize_costs,
+            {'resource_details': resource_details, 'cost_data': cost_data}
         )
-        
-        return recommendations
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,39 +1,37 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import Literal
-from app.cloud_providers.azure_client import AzureClient
-from app.cloud_providers.aws_client import AWSClient
-import os
+from datetime import date
+from functools import partial
+from app.cloud_providers.clients import get_aws_client, get_azure_client
+from app.services.cache import succeeded, ttl_cache
+from app.services.cost_cache import get_or_fetch
+from app.services.date_windows import date_window
 
 router = APIRouter()
 
-# Initialize cloud clients
-azure_client = AzureClient()
-aws_client = AWSClient(
-    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
-)
+@ttl_cache(ttl=300, cache_if=succeeded)
+def _fetch_cost_analysis(provider: str, timeframe: str):
+    """Fetch cost data from the provider; results are reused for 5 minutes"""
+    if provider == "azure":
+        azure_client = get_azure_client()
+        return get_or_fetch(
+            ("azure", azure_client.subscription_id, timeframe, date.today().isoformat()),
+            partial(azure_client.get_cost_analysis, timeframe)
+        )
+
+    # Convert timeframe to AWS format
+    start_date, end_date = date_window(30 if timeframe == "LastMonth" else 7)
+    return get_or_fetch(
+        ("aws", start_date, end_date),
+        partial(get_aws_client().get_cost_and_usage, start_date=start_date, end_date=end_date)
+    )
 
 @router.get("/{provider}")
-async def get_cost_analysis(
+def get_cost_analysis(
     provider: Literal["azure", "aws"],
-    timeframe: str = Query("LastMonth", regex="^(LastMonth|LastWeek)$")
+    timeframe: Literal["LastMonth", "LastWeek"] = Query("LastMonth")
 ):
     try:
-        if provider == "azure":
-            return azure_client.get_cost_analysis(timeframe)
-        else:
-            # Convert timeframe to AWS format
-            from datetime import datetime, timedelta
-            end_date = datetime.now()
-            
-            if timeframe == "LastMonth":
-                start_date = end_date - timedelta(days=30)
-            else:  # LastWeek
-                start_date = end_date - timedelta(days=7)
-                
-            return aws_client.get_cost_and_usage(
-                start_date=start_date.strftime("%Y-%m-%d"),
-                end_date=end_date.strftime("%Y-%m-%d")
-            )
+        return _fetch_cost_analysis(provider, timeframe)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
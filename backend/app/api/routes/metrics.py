@@ -1,51 +1,49 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import Literal
-from app.cloud_providers.azure_client import AzureClient
-from app.cloud_providers.aws_client import AWSClient
-import os
+from typing import Literal, Optional
+from app.cloud_providers.clients import get_aws_client, get_azure_client
+from app.services.cache import succeeded, ttl_cache
 from datetime import datetime, timedelta
 
 router = APIRouter()
 
-# Initialize cloud clients
-azure_client = AzureClient()
-aws_client = AWSClient(
-    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
-)
+@ttl_cache(ttl=60, cache_if=succeeded)
+def _fetch_metrics(provider: str, resource_id: str, metric_name: str, timeframe: str, region: Optional[str] = None):
+    """Fetch metrics from the provider; results are reused for 60 seconds"""
+    end_time = datetime.utcnow()
+    if timeframe == "LastDay":
+        start_time = end_time - timedelta(days=1)
+    elif timeframe == "LastWeek":
+        start_time = end_time - timedelta(days=7)
+    else:  # LastMonth
+        start_time = end_time - timedelta(days=30)
+
+    if provider == "azure":
+        # Implement Azure metrics retrieval
+        return get_azure_client().get_resource_metrics(
+            resource_id=resource_id,
+            metric_name=metric_name,
+            start_time=start_time,
+            end_time=end_time
+        )
+    # Implement AWS CloudWatch metrics retrieval
+    return get_aws_client().get_cloudwatch_metrics(
+        resource_id=resource_id,
+        metric_name=metric_name,
+        start_time=start_time,
+        end_time=end_time,
+        region=region
+    )
 
 @router.get("/{provider}/{resource_id}")
-async def get_resource_metrics(
+def get_resource_metrics(
     provider: Literal["azure", "aws"],
     resource_id: str,
     metric_name: str = Query(..., description="Name of the metric to retrieve"),
-    timeframe: str = Query("LastDay", regex="^(LastDay|LastWeek|LastMonth)$")
+    timeframe: Literal["LastDay", "LastWeek", "LastMonth"] = Query("LastDay"),
+    region: Optional[str] = Query(None, description="AWS region of the resource, skips the region lookup")
 ):
     try:
-        end_time = datetime.utcnow()
-        if timeframe == "LastDay":
-            start_time = end_time - timedelta(days=1)
-        elif timeframe == "LastWeek":
-            start_time = end_time - timedelta(days=7)
-        else:  # LastMonth
-            start_time = end_time - timedelta(days=30)
-
-        if provider == "azure":
-            # Implement Azure metrics retrieval
-            metrics = azure_client.get_resource_metrics(
-                resource_id=resource_id,
-                metric_name=metric_name,
-                start_time=start_time,
-                end_time=end_time
-            )
-        else:
-            # Implement AWS CloudWatch metrics retrieval
-            metrics = aws_client.get_cloudwatch_metrics(
-                resource_id=resource_id,
-                metric_name=metric_name,
-                start_time=start_time,
-                end_time=end_time
-            )
+        metrics = _fetch_metrics(provider, resource_id, metric_name, timeframe, region)
 
         return {
             "resourceId": resource_id,
@@ -1,42 +1,91 @@
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 from app.config import config
-from app.cloud_providers.aws_client import AWSClient
-from app.cloud_providers.azure_client import AzureClient
-from app.llm.llm_service import LLMService
-from datetime import datetime, timedelta
+from app.cloud_providers import clients
+from app.services.cache import LLMCache, SemanticCache
+from datetime import date, datetime, timedelta
 from typing import Union
+from functools import lru_cache, partial
+import asyncio
+import logging
+import orjson
+
+# The SDK-backed classes are imported lazily by the providers below, so an
+# AWS-only deployment never loads azure-mgmt and vice versa
+if TYPE_CHECKING:
+    from app.cloud_providers.aws_client import AWSClient
+    from app.cloud_providers.azure_client import AzureClient
+    from app.llm.llm_service import LLMService
+
+logger = logging.getLogger(__name__)
+
+# Lower-cased resource names handled by each /query branch
+COMPUTE_RESOURCES = frozenset({'ec2', 'instance', 'instances', 'vm', 'vms'})
+STORAGE_RESOURCES = frozenset({'s3', 'storage', 'blob'})
+COST_RESOURCES = frozenset({'cost', 'costs'})
 
 router = APIRouter()
 
+# Queries are parsed greedily so that a cached parse is the one the model
+# would give again
+QUERY_TEMPERATURE = 0
+
+# Identical LLM requests are answered from memory for an hour
+llm_cache = LLMCache(ttl=3600, maxsize=1024)
+# Paraphrased queries reuse the parsed command of a close enough earlier query.
+# Only parameter-free commands are shared: "CPU of i-0abc123" and "CPU of
+# i-0abc124" embed almost identically but must not share an instance ID.
+query_cache = SemanticCache(threshold=0.92, ttl=3600)
+
 class Query(BaseModel):
+    # Trim user input during validation and ignore unknown fields
+    model_config = ConfigDict(str_strip_whitespace=True, extra='ignore')
+
     query: str
     start_date: Optional[str] = None
     end_date: Optional[str] = None
 
-def get_aws_client() -> AWSClient:
-    """Dependency to get AWS client"""
+def get_aws_client() -> "AWSClient":
+    """Dependency to get the shared AWS client"""
     try:
-        return AWSClient(
-            aws_access_key_id=config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
-            region=config.AWS_DEFAULT_REGION
-        )
+        return clients.get_aws_client()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to initialize AWS client: {str(e)}")
 
-def get_azure_client() -> AzureClient:
-    """Dependency to get Azure client"""
+def get_azure_client() -> "AzureClient":
+    """Dependency to get the shared Azure client"""
     try:
-        return AzureClient()
+        return clients.get_azure_client()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to initialize Azure client: {str(e)}")
 
-def get_llm_service() -> LLMService:
-    """Dependency to get LLM service"""
+def get_optional_aws_client() -> Optional["AWSClient"]:
+    """Dependency returning the shared AWS client, or None if it can't be built"""
+    try:
+        return clients.get_aws_client()
+    except Exception as e:
+        logger.warning("AWS client unavailable: %s", e)
+        return None
+
+def get_optional_azure_client() -> Optional["AzureClient"]:
+    """Dependency returning the shared Azure client, or None if it can't be built"""
+    try:
+        return clients.get_azure_client()
+    except Exception as e:
+        logger.warning("Azure client unavailable: %s", e)
+        return None
+
+@lru_cache(maxsize=1)
+def _shared_llm_service() -> "LLMService":
+    from app.llm.llm_service import LLMService
+    return LLMService(api_key=config.OPENAI_API_KEY)
+
+def get_llm_service() -> "LLMService":
+    """Dependency to get the shared LLM service"""
     try:
-        return LLMService(api_key=config.OPENAI_API_KEY)
+        return _shared_llm_service()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to initialize LLM service: {str(e)}")
 
@@ -44,288 +93,531 @@ def convert_to_aws_filters(parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Convert LLM service parameters to AWS filter format"""
     filters = []
     for key, value in parameters.items():
-        # Skip empty values
-        if not value:
-            continue
-            
         if isinstance(value, list):
-            # Filter out empty values from lists
-            valid_values = [str(v) for v in value if v and str(v).strip()]
+            # Coerce each value once and drop empty ones
+            valid_values = [v for v in (str(v) for v in value if v) if v.strip()]
             if valid_values:
                 filters.append({"Name": key, "Values": valid_values})
-        elif value and str(value).strip():
-            filters.append({"Name": key, "Values": [str(value)]})
+        elif value:
+            value = str(value)
+            if value.strip():
+                filters.append({"Name": key, "Values": [value]})
     return filters
 
-@router.post("/query")
-def process_query(
+def interpret_query(llm: "LLMService", query: Query, available_platforms: List[str]) -> Dict[str, Any]:
+    """Parse a query with the LLM, reusing the result of a semantically similar query"""
+    context_key = LLMCache.key(s=query.start_date, e=query.end_date, p=available_platforms)
+    vector = None
+    # A sampled parse isn't worth sharing with other queries
+    if QUERY_TEMPERATURE == 0:
+        try:
+            vector = llm.embed_query(query.query)
+        except Exception:
+            # Embeddings are an optimization only; fall through to the LLM
+            pass
+
+    if vector is not None:
+        cached = query_cache.lookup(context_key, vector)
+        if cached is not None:
+            return cached
+
+    parsed = llm.process_cloud_query(
+        user_query=query.query,
+        available_platforms=available_platforms,
+        current_context={
+            "start_date": query.start_date,
+            "end_date": query.end_date
+        },
+        temperature=QUERY_TEMPERATURE
+    )
+    if vector is not None and not parsed.get('parameters'):
+        query_cache.add(context_key, vector, parsed)
+    return parsed
+
+def parse_query(llm: "LLMService", query: Query, available_platforms: List[str]) -> Dict[str, Any]:
+    """Parse a query through the exact-match cache, then the semantic one"""
+    return llm_cache.cached_or_call(
+        LLMCache.key(
+            op="process_cloud_query",
+            q=query.query,
+            s=query.start_date,
+            e=query.end_date,
+            p=available_platforms
+        ),
+        partial(interpret_query, llm, query, available_platforms)
+    )
+
+async def execute_query(
+    parsed: Dict[str, Any],
     query: Query,
-    aws: AWSClient = Depends(get_aws_client),
-    azure: AzureClient = Depends(get_azure_client),
-    llm: LLMService = Depends(get_llm_service)
-):
+    aws: Optional["AWSClient"],
+    azure: Optional["AzureClient"],
+    llm: "LLMService",
+    regions: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Run a parsed query against the matching cloud and build the /query response"""
+    # Process based on the parsed query
     try:
-        # Get available cloud platforms
-        available_platforms = ["AWS", "Azure"]
+        logger.debug("Resources: %s", parsed['resources'])
+        logger.debug("Action: %s", parsed['action'])
         
-        # Process the query using LLM service
-        parsed = llm.process_cloud_query(
-            user_query=query.query,
-            available_platforms=available_platforms,
-            current_context={
-                "start_date": query.start_date,
-                "end_date": query.end_date
-            }
-        )
-        
-        print("DEBUG - Parsed Query:", parsed)  # Debug log
+        # Determine cloud platform
+        platform = parsed.get('platform', 'aws').lower()
+        # Normalize the requested resources and action once for the dispatch below
+        resources = {r.lower() for r in parsed.get('resources') or []}
+        action = (parsed.get('action') or '').lower()
         
-        # Process based on the parsed query
-        try:
-            print("DEBUG - Resources:", parsed['resources'])  # Debug log
-            print("DEBUG - Action:", parsed['action'])  # Debug log
-            
-            # Determine cloud platform
-            platform = parsed.get('platform', 'aws').lower()
-            
-            # Handle compute instances (EC2/VMs)
-            if any(r.lower() in ['ec2', 'instance', 'instances', 'vm', 'vms'] for r in parsed.get('resources', [])):
-                if platform == 'aws':
-                    filters = convert_to_aws_filters(parsed.get('parameters', {}))
-                    data = aws.list_ec2_instances(filters=filters)
-                    if not data:
-                        return {
-                            "message": "No EC2 instances found",
-                            "query": query.query,
-                            "parsed_query": parsed,
-                            "data": {},
-                            "details": {
-                                "status": "empty",
-                                "reason": "No EC2 instances match your query criteria. This could be because:",
-                                "possible_reasons": [
-                                    "No EC2 instances exist in your AWS account",
-                                    "No instances match the specified filters",
-                                    "Instances exist in regions not currently accessible"
-                                ],
-                                "applied_filters": filters
-                            }
+        # Handle compute instances (EC2/VMs)
+        if resources & COMPUTE_RESOURCES:
+            if platform == 'aws':
+                filters = convert_to_aws_filters(parsed.get('parameters', {}))
+                data = await aws.list_ec2_instances_async(filters=filters, regions=regions)
+                if not data:
+                    return {
+                        "message": "No EC2 instances found",
+                        "query": query.query,
+                        "parsed_query": parsed,
+                        "data": {},
+                        "details": {
+                            "status": "empty",
+                            "reason": "No EC2 instances match your query criteria. This could be because:",
+                            "possible_reasons": [
+                                "No EC2 instances exist in your AWS account",
+                                "No instances match the specified filters",
+                                "Instances exist in regions not currently accessible"
+                            ],
+                            "applied_filters": filters
                         }
-                else:  # Azure
-                    resource_group = parsed.get('parameters', {}).get('resource_group')
-                    data = azure.list_virtual_machines(resource_group=resource_group)
-                    if not data:
-                        return {
-                            "message": "No Azure VMs found",
-                            "query": query.query,
-                            "parsed_query": parsed,
-                            "data": {},
-                            "details": {
-                                "status": "empty",
-                                "reason": "No Azure VMs match your query criteria. This could be because:",
-                                "possible_reasons": [
-                                    "No VMs exist in your Azure subscription",
-                                    "No VMs exist in the specified resource group",
-                                    "VMs exist but are not accessible with current permissions"
-                                ],
-                                "resource_group": resource_group
-                            }
+                    }
+            else:  # Azure
+                resource_group = parsed.get('parameters', {}).get('resource_group')
+                data = await azure.list_virtual_machines_async(resource_group=resource_group)
+                if not data:
+                    return {
+                        "message": "No Azure VMs found",
+                        "query": query.query,
+                        "parsed_query": parsed,
+                        "data": {},
+                        "details": {
+                            "status": "empty",
+                            "reason": "No Azure VMs match your query criteria. This could be because:",
+                            "possible_reasons": [
+                                "No VMs exist in your Azure subscription",
+                                "No VMs exist in the specified resource group",
+                                "VMs exist but are not accessible with current permissions"
+                            ],
+                            "resource_group": resource_group
                         }
-            
-            # Handle storage (S3/Blob Storage)
-            elif any(r.lower() in ['s3', 'storage', 'blob'] for r in parsed['resources']):
-                if platform == 'aws':
-                    data = aws.list_s3_buckets()
-                    if not data:
-                        return {
-                            "message": "No S3 buckets found",
-                            "query": query.query,
-                            "parsed_query": parsed,
-                            "data": {},
-                            "details": {
-                                "status": "empty",
-                                "reason": "No S3 buckets were found. This could be because:",
-                                "possible_reasons": [
-                                    "No S3 buckets exist in your AWS account",
-                                    "Buckets exist but are not accessible with current permissions",
-                                    "Buckets exist in regions not currently accessible"
-                                ]
-                            }
+                    }
+        
+        # Handle storage (S3/Blob Storage)
+        elif resources & STORAGE_RESOURCES:
+            if platform == 'aws':
+                data = await asyncio.to_thread(aws.list_s3_buckets)
+                if not data:
+                    return {
+                        "message": "No S3 buckets found",
+                        "query": query.query,
+                        "parsed_query": parsed,
+                        "data": {},
+                        "details": {
+                            "status": "empty",
+                            "reason": "No S3 buckets were found. This could be because:",
+                            "possible_reasons": [
+                                "No S3 buckets exist in your AWS account",
+                                "Buckets exist but are not accessible with current permissions",
+                                "Buckets exist in regions not currently accessible"
+                            ]
                         }
-                else:  # Azure
-                    data = azure.list_storage_accounts()
-                    if data.get('status') == 'empty':
-                        return {
-                            "message": "No Azure storage accounts found",
-                            "query": query.query,
-                            "parsed_query": parsed,
-                            "data": {},
-                            "details": {
-                                "status": "empty",
-                                "reason": "No Azure storage accounts were found. This could be because:",
-                                "possible_reasons": [
-                                    "No storage accounts exist in your Azure subscription",
-                                    "Storage accounts exist but are not accessible with current permissions",
-                                    "Storage accounts exist in regions not currently accessible"
-                                ]
-                            }
+                    }
+            else:  # Azure
+                data = await asyncio.to_thread(azure.list_storage_accounts)
+                if data.get('status') == 'empty':
+                    return {
+                        "message": "No Azure storage accounts found",
+                        "query": query.query,
+                        "parsed_query": parsed,
+                        "data": {},
+                        "details": {
+                            "status": "empty",
+                            "reason": "No Azure storage accounts were found. This could be because:",
+                            "possible_reasons": [
+                                "No storage accounts exist in your Azure subscription",
+                                "Storage accounts exist but are not accessible with current permissions",
+                                "Storage accounts exist in regions not currently accessible"
+                            ]
                         }
+                    }
+        
+        # Handle costs and usage
+        elif resources & COST_RESOURCES or 'cost' in action:
+            # Use provided dates or default to last 30 days
+            now = datetime.utcnow()
+            end_date = query.end_date or now.strftime('%Y-%m-%d')
+            start_date = query.start_date or (now - timedelta(days=30)).strftime('%Y-%m-%d')
             
-            # Handle costs and usage
-            elif any(r in ['costs', 'cost'] for r in parsed['resources']) or 'cost' in parsed['action'].lower():
-                # Use provided dates or default to last 30 days
-                end_date = query.end_date or datetime.now().strftime('%Y-%m-%d')
-                start_date = query.start_date or (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
-                
-                if platform == 'aws':
-                    data = aws.get_cost_and_usage(start_date=start_date, end_date=end_date)
-                else:  # Azure
-                    data = azure.get_cost_analysis(timeframe='LastMonth' if (datetime.now() - datetime.strptime(start_date, '%Y-%m-%d')).days >= 30 else 'LastWeek')
-                
-                # Get cost optimization recommendations if available
-                try:
-                    recommendations = llm.get_cost_optimization(
+            if platform == 'aws':
+                data = await asyncio.to_thread(aws.get_cost_and_usage, start_date=start_date, end_date=end_date)
+            else:  # Azure
+                delta_days = (now.date() - date.fromisoformat(start_date)).days
+                timeframe = 'LastMonth' if delta_days >= 30 else 'LastWeek'
+                data = await asyncio.to_thread(azure.get_cost_analysis, timeframe=timeframe)
+            
+            # Get cost optimization recommendations if available
+            try:
+                recommendations = await asyncio.to_thread(
+                    llm_cache.cached_or_call,
+                    LLMCache.key(op="get_cost_optimization", costs=data),
+                    partial(
+                        llm.get_cost_optimization,
                         resource_details={"costs": data},
                         cost_data=data
                     )
-                    if isinstance(data, dict) and 'data' in data:
-                        data['data']['optimization_recommendations'] = recommendations
-                    else:
-                        data['optimization_recommendations'] = recommendations
-                except Exception:
-                    # Don't fail if optimization recommendations fail
-                    pass
+                )
+                if isinstance(data, dict) and 'data' in data:
+                    data['data']['optimization_recommendations'] = recommendations
+                else:
+                    data['optimization_recommendations'] = recommendations
+            except Exception:
+                # Don't fail if optimization recommendations fail
+                pass
+        
+        # Handle metrics
+        elif 'metrics' in resources or 'get_metrics' in action:
+            # Get time range
+            end_time = datetime.now()
+            start_time = end_time - timedelta(hours=24)
             
-            # Handle metrics
-            elif "metrics" in parsed.get('resources', []) or "get_metrics" in parsed.get('action', '').lower():
-                # Get time range
-                end_time = datetime.now()
-                start_time = end_time - timedelta(hours=24)
+            if platform == 'aws':
+                # Extract instance IDs and metric names from parameters
+                parameters = parsed.get('parameters', {})
+                instance_ids = parameters.get('instance-id', '')
+                if not isinstance(instance_ids, list):
+                    instance_ids = [instance_ids]
+                # Clean up instance IDs (remove quotes if present)
+                instance_ids = [str(i).strip('"') for i in instance_ids if i]
+                if not instance_ids:
+                    raise HTTPException(status_code=400, detail="Instance ID is required for metrics queries")
+
+                metric_names = parameters.get('metric_name', 'CPUUtilization')
+                if not isinstance(metric_names, list):
+                    metric_names = [metric_names]
+                metric_names = [str(m).strip('"') for m in metric_names if m] or ['CPUUtilization']
+                instance_label = ', '.join(instance_ids)
                 
-                if platform == 'aws':
-                    # Extract instance ID from parameters
-                    instance_id = parsed.get('parameters', {}).get('instance-id', '')
-                    if not instance_id:
-                        raise HTTPException(status_code=400, detail="Instance ID is required for metrics queries")
-                    
-                    # Clean up instance ID (remove quotes if present)
-                    instance_id = instance_id.strip('"')
-                    
-                    # First verify if the instance exists
-                    instances = aws.list_ec2_instances(filters=[{"Name": "instance-id", "Values": [instance_id]}])
-                    if not instances:
-                        return {
-                            "message": "Instance not found",
-                            "query": query.query,
-                            "parsed_query": parsed,
-                            "data": {},
-                            "details": {
-                                "status": "error",
-                                "reason": f"EC2 instance {instance_id} not found. This could be because:",
-                                "possible_reasons": [
-                                    "The instance ID is incorrect",
-                                    "The instance has been terminated",
-                                    "The instance exists in a different region",
-                                    "Insufficient permissions to access the instance"
-                                ]
-                            }
+                # First verify the instances exist, and find their regions
+                instances = await aws.list_ec2_instances_async(filters=[{"Name": "instance-id", "Values": instance_ids}], regions=regions)
+                if not instances:
+                    return {
+                        "message": "Instance not found",
+                        "query": query.query,
+                        "parsed_query": parsed,
+                        "data": {},
+                        "details": {
+                            "status": "error",
+                            "reason": f"EC2 instance {instance_label} not found. This could be because:",
+                            "possible_reasons": [
+                                "The instance ID is incorrect",
+                                "The instance has been terminated",
+                                "The instance exists in a different region",
+                                "Insufficient permissions to access the instance"
+                            ]
                         }
-                    
-                    data = aws.get_cloudwatch_metrics(
-                        resource_id=instance_id,
-                        metric_name=parsed.get('parameters', {}).get('metric_name', 'CPUUtilization').strip('"'),
+                    }
+                
+                # One batched GetMetricData call per region for every instance x metric
+                region_metrics = await asyncio.gather(*(
+                    asyncio.to_thread(
+                        aws.get_metric_data,
+                        [
+                            {"resource_id": instance['InstanceId'], "metric_name": metric_name}
+                            for instance in region_instances
+                            for metric_name in metric_names
+                        ],
                         start_time=start_time,
-                        end_time=end_time
+                        end_time=end_time,
+                        region=region
                     )
-                    
-                    if not data:
-                        return {
-                            "message": "No metrics data found",
-                            "query": query.query,
-                            "parsed_query": parsed,
-                            "data": {},
-                            "details": {
-                                "status": "empty",
-                                "reason": f"No metrics data found for instance {instance_id}. This could be because:",
-                                "possible_reasons": [
-                                    "CloudWatch metrics are not enabled for this instance",
-                                    "No metric data available for the last 24 hours",
-                                    "The instance was stopped during this period",
-                                    "Insufficient permissions to access CloudWatch metrics"
-                                ],
-                                "instance_id": instance_id,
-                                "metric_name": parsed.get('parameters', {}).get('metric_name', 'CPUUtilization').strip('"'),
-                                "time_range": {
-                                    "start": start_time.isoformat(),
-                                    "end": end_time.isoformat()
-                                }
+                    for region, region_instances in instances.items()
+                ))
+                metrics = {}
+                for result in region_metrics:
+                    metrics.update(result)
+
+                if len(instance_ids) == 1 and len(metric_names) == 1:
+                    data = metrics.get(instance_ids[0], {}).get(metric_names[0], [])
+                else:
+                    data = {
+                        instance_id: points
+                        for instance_id, points in metrics.items()
+                        if any(points.values())
+                    }
+                
+                if not data:
+                    return {
+                        "message": "No metrics data found",
+                        "query": query.query,
+                        "parsed_query": parsed,
+                        "data": {},
+                        "details": {
+                            "status": "empty",
+                            "reason": f"No metrics data found for instance {instance_label}. This could be because:",
+                            "possible_reasons": [
+                                "CloudWatch metrics are not enabled for this instance",
+                                "No metric data available for the last 24 hours",
+                                "The instance was stopped during this period",
+                                "Insufficient permissions to access CloudWatch metrics"
+                            ],
+                            "instance_id": instance_label,
+                            "metric_name": ', '.join(metric_names),
+                            "time_range": {
+                                "start": start_time.isoformat(),
+                                "end": end_time.isoformat()
                             }
                         }
-                else:  # Azure
-                    # Extract VM details from parameters
-                    resource_group = parsed.get('parameters', {}).get('resource_group')
-                    vm_name = parsed.get('parameters', {}).get('vm_name')
-                    
-                    if not all([resource_group, vm_name]):
-                        raise HTTPException(status_code=400, detail="Resource group and VM name are required for Azure metrics queries")
-                    
-                    data = azure.get_vm_metrics(
-                        resource_group=resource_group,
-                        vm_name=vm_name,
-                        metric_names=parsed.get('parameters', {}).get('metric_names', None)
-                    )
-                    
-                    if data.get('status') == 'error':
-                        return {
-                            "message": "Failed to get VM metrics",
-                            "query": query.query,
-                            "parsed_query": parsed,
-                            "data": {},
-                            "details": {
-                                "status": "error",
-                                "reason": f"Failed to get metrics for VM {vm_name}. This could be because:",
-                                "possible_reasons": [
-                                    "The VM does not exist",
-                                    "The VM exists in a different resource group",
-                                    "The VM is not running",
-                                    "Azure Monitor is not enabled for this VM",
-                                    "Insufficient permissions to access metrics"
-                                ],
-                                "resource_group": resource_group,
-                                "vm_name": vm_name,
-                                "time_range": {
-                                    "start": start_time.isoformat(),
-                                    "end": end_time.isoformat()
-                                }
+                    }
+            else:  # Azure
+                # Extract VM details from parameters
+                resource_group = parsed.get('parameters', {}).get('resource_group')
+                vm_name = parsed.get('parameters', {}).get('vm_name')
+                
+                if not all([resource_group, vm_name]):
+                    raise HTTPException(status_code=400, detail="Resource group and VM name are required for Azure metrics queries")
+                
+                data = await asyncio.to_thread(
+                    azure.get_vm_metrics,
+                    resource_group=resource_group,
+                    vm_name=vm_name,
+                    metric_names=parsed.get('parameters', {}).get('metric_names', None)
+                )
+                
+                if data.get('status') == 'error':
+                    return {
+                        "message": "Failed to get VM metrics",
+                        "query": query.query,
+                        "parsed_query": parsed,
+                        "data": {},
+                        "details": {
+                            "status": "error",
+                            "reason": f"Failed to get metrics for VM {vm_name}. This could be because:",
+                            "possible_reasons": [
+                                "The VM does not exist",
+                                "The VM exists in a different resource group",
+                                "The VM is not running",
+                                "Azure Monitor is not enabled for this VM",
+                                "Insufficient permissions to access metrics"
+                            ],
+                            "resource_group": resource_group,
+                            "vm_name": vm_name,
+                            "time_range": {
+                                "start": start_time.isoformat(),
+                                "end": end_time.isoformat()
                             }
                         }
-            
-            else:
-                raise HTTPException(status_code=400, detail=f"Unsupported resource type or action")
+                    }
+        
+        else:
+            raise HTTPException(status_code=400, detail=f"Unsupported resource type or action")
 
-        except Exception as operation_error:
-            # Analyze the error using LLM service
-            error_analysis = llm.analyze_error(
+    except Exception as operation_error:
+        # Analyze the error using LLM service
+        error_analysis = await asyncio.to_thread(
+            llm_cache.cached_or_call,
+            LLMCache.key(
+                op="analyze_error",
+                action=parsed.get('action', 'unknown'),
+                error=str(operation_error),
+                resources=parsed.get('resources', [])
+            ),
+            partial(
+                llm.analyze_error,
                 operation=parsed.get('action', 'unknown'),
                 error_message=str(operation_error),
                 platform="AWS",
                 resource=str(parsed.get('resources', []))
             )
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "error": str(operation_error),
-                    "analysis": error_analysis
-                }
-            )
+        )
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": str(operation_error),
+                "analysis": error_analysis
+            }
+        )
+
+    return {
+        "message": "Success",
+        "query": query.query,
+        "parsed_query": parsed,
+        "data": data
+    }
 
-        return {
-            "message": "Success",
-            "query": query.query,
-            "parsed_query": parsed,
-            "data": data
-        }
+@router.post("/query")
+async def process_query(
+    query: Query,
+    request: Request,
+    aws: "AWSClient" = Depends(get_aws_client),
+    azure: "AzureClient" = Depends(get_azure_client),
+    llm: "LLMService" = Depends(get_llm_service)
+):
+    try:
+        # Get available cloud platforms
+        available_platforms = ["AWS", "Azure"]
+        # Regions discovered at startup, if the prefetch succeeded
+        regions = getattr(request.app.state, 'regions', None)
+        
+        # Process the query using LLM service
+        parsed = await asyncio.to_thread(parse_query, llm, query, available_platforms)
+        
+        logger.debug("Parsed Query: %s", parsed)
+        
+        return await execute_query(parsed, query, aws, azure, llm, regions)
 
     except Exception as e:
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/query/stream")
+async def stream_query(
+    query: Query,
+    request: Request,
+    aws: Optional["AWSClient"] = Depends(get_optional_aws_client),
+    azure: Optional["AzureClient"] = Depends(get_optional_azure_client),
+    llm: "LLMService" = Depends(get_llm_service)
+):
+    """Process a query, streaming NDJSON: the LLM's reply as it is decoded,
+    the parsed command, then compute listings region by region as each
+    region's scan completes. Other queries produce a single line with the
+    /query response."""
+    available_platforms = [name for name, client in (("AWS", aws), ("Azure", azure)) if client is not None]
+    # Bail out before calling the LLM if no cloud is usable at all
+    if not available_platforms:
+        raise HTTPException(status_code=503, detail="No cloud client is available. Please check your credentials.")
+    regions = getattr(request.app.state, 'regions', None)
+
+    async def generate():
+        try:
+            async for kind, value in llm.astream_process_cloud_query(
+                user_query=query.query,
+                available_platforms=available_platforms,
+                current_context={
+                    "start_date": query.start_date,
+                    "end_date": query.end_date
+                },
+                temperature=QUERY_TEMPERATURE
+            ):
+                if kind == 'delta':
+                    yield orjson.dumps({"llm_delta": value}) + b'\n'
+                else:
+                    parsed = value
+        except Exception as e:
+            yield orjson.dumps({"error": str(e)}) + b'\n'
+            return
+        yield orjson.dumps({"parsed_query": parsed}) + b'\n'
+
+        platform = parsed.get('platform', 'aws').lower()
+        if (aws if platform == 'aws' else azure) is None:
+            label = 'AWS' if platform == 'aws' else 'Azure'
+            yield orjson.dumps({"error": f"{label} client not initialized. Please check {label} credentials."}) + b'\n'
+            return
+
+        try:
+            resources = {r.lower() for r in parsed.get('resources') or []}
+            if not resources & COMPUTE_RESOURCES:
+                yield orjson.dumps(await execute_query(parsed, query, aws, azure, llm, regions), default=str) + b'\n'
+            elif platform == 'aws':
+                filters = convert_to_aws_filters(parsed.get('parameters', {}))
+                async for region, instances in aws.iter_ec2_regions_async(filters=filters, regions=regions):
+                    yield orjson.dumps({"region": region, "data": instances}) + b'\n'
+            else:
+                resource_group = parsed.get('parameters', {}).get('resource_group')
+                # Resource Graph returns every region in one response
+                region_vms = await azure.list_virtual_machines_async(resource_group=resource_group)
+                for region, vms in region_vms.items():
+                    yield orjson.dumps({"region": region, "data": vms}) + b'\n'
+        except HTTPException as e:
+            yield orjson.dumps({"error": e.detail}, default=str) + b'\n'
+        except Exception as e:
+            yield orjson.dumps({"error": str(e)}) + b'\n'
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+class BatchQuery(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True, extra='ignore')
+
+    queries: List[str]
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+@router.get("/aws/ec2/stream")
+def stream_ec2_instances(
+    request: Request,
+    minimal: bool = False,
+    aws: "AWSClient" = Depends(get_aws_client)
+):
+    """Stream EC2 instances as NDJSON, one instance per line, region by region"""
+    regions = getattr(request.app.state, 'regions', None)
+
+    def generate():
+        for region, instance in aws.iter_ec2_instances(regions=regions, minimal=minimal):
+            yield orjson.dumps(instance) + b'\n'
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/azure/resource-groups/stream")
+def stream_resource_groups(azure: "AzureClient" = Depends(get_azure_client)):
+    """Stream Azure resource groups as NDJSON, one group per line"""
+    def generate():
+        for group in azure.iter_resource_groups():
+            yield orjson.dumps(group) + b'\n'
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+@router.get("/azure/snapshot")
+async def azure_snapshot(azure: "AzureClient" = Depends(get_azure_client)):
+    """Azure VMs, storage accounts, resource groups and costs in one response"""
+    return await azure.snapshot()
+
+@router.post("/query/batch")
+async def submit_query_batch(
+    batch: BatchQuery,
+    llm: "LLMService" = Depends(get_llm_service)
+):
+    """Queue queries for interpretation through the OpenAI Batch API"""
+    if not batch.queries:
+        raise HTTPException(status_code=400, detail="At least one query is required")
+    try:
+        batch_id = await asyncio.to_thread(
+            llm.submit_batch,
+            queries=batch.queries,
+            available_platforms=["AWS", "Azure"],
+            current_context={
+                "start_date": batch.start_date,
+                "end_date": batch.end_date
+            },
+            temperature=QUERY_TEMPERATURE
+        )
+        return {"batch_id": batch_id, "status": "submitted"}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/query/batch/{batch_id}")
+async def get_query_batch(
+    batch_id: str,
+    llm: "LLMService" = Depends(get_llm_service)
+):
+    """Batch status, with the parsed queries once the batch has completed"""
+    try:
+        return await asyncio.to_thread(llm.get_batch_results, batch_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cache/stats")
+def cache_stats():
+    """Hit/miss counters for the LLM response caches"""
+    return {
+        "exact": llm_cache.stats(),
+        "semantic": query_cache.stats()
+    }
@@ -1,86 +1,545 @@
-import boto3
 import os
-from typing import Dict, List, Any
-from botocore.exceptions import ClientError
+from typing import AsyncIterator, Dict, Iterator, List, Any, Optional, Tuple, Union
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import csv
 import datetime
+import gzip
+import json
+import logging
+import threading
+import time
+
+from app.services.cache import ttl_cache
+
+logger = logging.getLogger(__name__)
+
+# Object cap for the listing fallback when a bucket has no storage metrics yet
+SAMPLE_MAX_KEYS = 10000
+
+# Instance states listed by default; terminated instances linger for an hour
+LIVE_INSTANCE_STATES = ['pending', 'running', 'stopping', 'stopped']
+
+# Units of the AWS/EC2 metrics that aren't plain counts
+EC2_METRIC_UNITS = {
+    'CPUUtilization': 'Percent',
+    'NetworkIn': 'Bytes',
+    'NetworkOut': 'Bytes',
+    'DiskReadBytes': 'Bytes',
+    'DiskWriteBytes': 'Bytes',
+    'EBSReadBytes': 'Bytes',
+    'EBSWriteBytes': 'Bytes',
+    'EBSIOBalance%': 'Percent',
+    'EBSByteBalance%': 'Percent'
+}
+
+# boto3 loads its service models on import, which takes a noticeable share of
+# startup; these are bound by _load_boto3() when the first AWSClient is built
+boto3 = None
+Config = None
+ClientError = None
+
+def _load_boto3():
+    global boto3, Config, ClientError
+    if boto3 is None:
+        import boto3 as _boto3
+        from botocore.config import Config as _Config
+        from botocore.exceptions import ClientError as _ClientError
+        boto3, Config, ClientError = _boto3, _Config, _ClientError
+
+def _flatten_reservations(reservations: List[Dict[str, Any]], region: str) -> List[Dict[str, Any]]:
+    """Turn a DescribeInstances page's reservations into instance summaries for `region`"""
+    instances = []
+    for instance in (i for r in reservations for i in r['Instances']):
+        tags = instance.get('Tags') or []
+        # Extract instance details with error handling
+        instance_details = {
+            'InstanceId': instance.get('InstanceId', 'Unknown'),
+            'InstanceType': instance.get('InstanceType', 'Unknown'),
+            'State': instance.get('State', {}).get('Name', 'Unknown'),
+            'Region': region,
+            'Tags': tags,
+            'PublicIpAddress': instance.get('PublicIpAddress', 'None'),
+            'PrivateIpAddress': instance.get('PrivateIpAddress', 'None'),
+            'VpcId': instance.get('VpcId', 'None'),
+            'SubnetId': instance.get('SubnetId', 'None')
+        }
+
+        # Add launch time if available; datetimes are left for the response
+        # encoder (orjson) to format
+        if 'LaunchTime' in instance:
+            instance_details['LaunchTime'] = instance['LaunchTime']
+
+        # Add name tag if available; Tags stays a list for existing consumers
+        name_tag = {tag['Key']: tag['Value'] for tag in tags}.get('Name') if tags else None
+        if name_tag:
+            instance_details['Name'] = name_tag
+
+        instances.append(instance_details)
+    return instances
 
 class AWSClient:
     def __init__(self, aws_access_key_id: str = None, aws_secret_access_key: str = None, region: str = None):
         if not aws_access_key_id or not aws_secret_access_key:
             raise ValueError("AWS credentials are required (access key and secret key)")
-        
+        _load_boto3()
+
+        # Every service client shares this session and a larger connection pool,
+        # so repeated calls reuse keep-alive connections instead of new TLS handshakes.
+        # TCP keepalive stops idle pooled connections being silently dropped.
+        # Adaptive retries rate-limit client-side under fan-out; AWS_RETRY_MODE and
+        # AWS_MAX_ATTEMPTS override the defaults
+        self._config = Config(
+            max_pool_connections=64,
+            retries={
+                'mode': os.getenv('AWS_RETRY_MODE', 'adaptive'),
+                'max_attempts': int(os.getenv('AWS_MAX_ATTEMPTS', '10'))
+            },
+            connect_timeout=3,
+            read_timeout=20,
+            tcp_keepalive=True
+        )
+        # One client per (service, region), built on first use and reused
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        # (fetched_at, regions); the region list changes rarely, so refresh daily
+        self._regions_cache = None
+        # A bucket's region never changes, so look it up once per bucket
+        self._bucket_region_cache: Dict[str, str] = {}
+        # Instance ID -> region, filled in whenever instances are listed
+        self._instance_region_cache: Dict[str, str] = {}
+        # Regional endpoints are independent, so per-region and per-bucket calls
+        # are fanned out on this pool. boto3 sessions aren't thread-safe, hence
+        # the lock around client creation from worker threads.
+        self._executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='aws-region')
+        # Per-bucket metadata lookups are submitted from _executor tasks, so they
+        # need their own pool to avoid waiting on themselves
+        self._metadata_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='aws-bucket')
+        self._session_lock = threading.Lock()
+        # Cap in-flight fan-out calls to stay clear of API throttling
+        self._api_slots = threading.Semaphore(8)
+
+        # Credentials are validated separately by verify_credentials(), at startup
+        # and periodically, rather than with an STS round-trip per construction
+        self.session = boto3.Session(
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            region_name=region or os.getenv('AWS_REGION', 'eu-west-2')
+        )
+
+    def verify_credentials(self) -> Dict[str, str]:
+        """Check the credentials with STS and return the caller identity"""
         try:
-            self.session = boto3.Session(
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                region_name=region or os.getenv('AWS_REGION', 'eu-west-2')
-            )
-            # Test the credentials
-            sts = self.session.client('sts')
-            sts.get_caller_identity()
+            sts = self._client('sts')
+            identity = sts.get_caller_identity()
+            return {
+                'Account': identity['Account'],
+                'Arn': identity['Arn'],
+                'UserId': identity['UserId']
+            }
         except ClientError as e:
-            raise ValueError(f"Failed to initialize AWS client: {str(e)}")
+            raise ValueError(f"Failed to verify AWS credentials: {str(e)}")
+
+    def _throttled(self, func, *args):
+        """Run func once an API slot is free"""
+        with self._api_slots:
+            return func(*args)
+
+    def _client(self, service: str, region: str = None):
+        """Return the pooled client for a service and region, creating it on first use"""
+        key = (service, region or self.session.region_name)
+        client = self._clients.get(key)
+        if client is None:
+            with self._session_lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self.session.client(service, region_name=key[1], config=self._config)
+                    self._clients[key] = client
+        return client
+
+    def refresh_regions(self) -> List[str]:
+        """Drop the cached region list and fetch it again"""
+        self._regions_cache = None
+        return self._get_all_regions()
 
     def _get_all_regions(self) -> List[str]:
-        """Get list of all AWS regions"""
+        """Get list of all AWS regions, cached for 24 hours"""
+        cached = self._regions_cache
+        if cached and time.monotonic() - cached[0] < 86400:
+            return cached[1]
         try:
-            ec2 = self.session.client('ec2')
+            ec2 = self._client('ec2')
             regions = [region['RegionName'] for region in ec2.describe_regions()['Regions']]
+            self._regions_cache = (time.monotonic(), regions)
             return regions
         except ClientError as e:
             raise Exception(f'Error getting regions: {str(e)}')
 
-    def list_ec2_instances(self, filters: List[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
-        """List EC2 instances across all regions with optional filters"""
+    def _describe_region_instances(self, ec2, region: str, filters: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Describe the EC2 instances in a single region"""
+        # Page through every reservation; a single call stops at the first page
+        paginator = ec2.get_paginator('describe_instances')
+        pages = paginator.paginate(Filters=filters or [], PaginationConfig={'PageSize': 1000})
+        
+        instances = []
+        for page in pages:
+            page_instances = _flatten_reservations(page['Reservations'], region)
+            instances.extend(page_instances)
+            self._instance_region_cache.update(
+                (instance['InstanceId'], region) for instance in page_instances
+            )
+        return instances
+
+    def _describe_region_instance_status(self, ec2, region: str, filters: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """List ID, state and availability zone of the EC2 instances in a single region.
+
+        DescribeInstanceStatus returns a fraction of DescribeInstances' payload,
+        so this is much cheaper when only instance states are needed.
+        """
+        paginator = ec2.get_paginator('describe_instance_status')
+        pages = paginator.paginate(
+            Filters=filters or [],
+            IncludeAllInstances=True,
+            PaginationConfig={'PageSize': 1000}
+        )
+
+        instances = []
+        for status in (s for page in pages for s in page['InstanceStatuses']):
+            instances.append({
+                'InstanceId': status['InstanceId'],
+                'State': status.get('InstanceState', {}).get('Name', 'Unknown'),
+                'Region': region,
+                'AvailabilityZone': status.get('AvailabilityZone', 'Unknown')
+            })
+            self._instance_region_cache[status['InstanceId']] = region
+        return instances
+
+    def _submit_region_scans(self, filters: List[Dict[str, Any]], regions: List[str], minimal: bool):
+        """Start one instance scan per region on the pool, returning {region: future}"""
+        filters = list(filters or [])
+        if not any(f.get('Name') in ('instance-state-name', 'instance-id') for f in filters):
+            filters.append({'Name': 'instance-state-name', 'Values': LIVE_INSTANCE_STATES})
+        describe = self._describe_region_instance_status if minimal else self._describe_region_instances
+
+        return {
+            region: self._executor.submit(
+                self._throttled,
+                describe,
+                self._client('ec2', region),
+                region,
+                filters
+            )
+            for region in regions
+        }
+
+    def _collect_region_scans(self, outcomes: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """Merge per-region results (instance lists or ClientErrors) in region order"""
         all_instances = {}
-        regions = self._get_all_regions()
+        for region, instances in outcomes.items():
+            if isinstance(instances, ClientError):
+                logger.warning('Error listing EC2 instances in %s: %s', region, instances)
+                continue
+            if instances:  # Only add regions that have instances
+                all_instances[region] = instances
+        return all_instances
+
+    def list_ec2_instances(self, filters: List[Dict[str, Any]] = None, regions: List[str] = None,
+                           minimal: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """List EC2 instances across all regions with optional filters.
+
+        Terminated and shutting-down instances are left out unless the filters
+        mention a state or specific instance IDs. Pass a previously discovered
+        `regions` list to skip region lookup, and minimal=True to return only
+        ID, state and availability zone from the lighter status API.
+        """
+        # Query every region concurrently
+        futures = self._submit_region_scans(filters, regions or self._get_all_regions(), minimal)
 
-        for region in regions:
+        outcomes = {}
+        for region, future in futures.items():
             try:
-                ec2 = self.session.client('ec2', region_name=region)
-                if filters:
-                    response = ec2.describe_instances(Filters=filters)
-                else:
-                    response = ec2.describe_instances()
-                
-                instances = []
-                for reservation in response['Reservations']:
-                    for instance in reservation['Instances']:
-                        # Extract instance details with error handling
-                        instance_details = {
-                            'InstanceId': instance.get('InstanceId', 'Unknown'),
-                            'InstanceType': instance.get('InstanceType', 'Unknown'),
-                            'State': instance.get('State', {}).get('Name', 'Unknown'),
-                            'Region': region,
-                            'Tags': instance.get('Tags', []),
-                            'PublicIpAddress': instance.get('PublicIpAddress', 'None'),
-                            'PrivateIpAddress': instance.get('PrivateIpAddress', 'None'),
-                            'VpcId': instance.get('VpcId', 'None'),
-                            'SubnetId': instance.get('SubnetId', 'None')
-                        }
-                        
-                        # Add launch time if available
-                        if 'LaunchTime' in instance:
-                            instance_details['LaunchTime'] = instance['LaunchTime'].isoformat()
-                        
-                        # Add name tag if available
-                        name_tag = next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), None)
-                        if name_tag:
-                            instance_details['Name'] = name_tag
-                        
-                        instances.append(instance_details)
-                if instances:  # Only add regions that have instances
-                    all_instances[region] = instances
+                outcomes[region] = future.result()
+            except ClientError as e:
+                outcomes[region] = e
+        return self._collect_region_scans(outcomes)
+
+    def iter_ec2_instances(self, filters: List[Dict[str, Any]] = None, regions: List[str] = None,
+                           minimal: bool = False) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (region, instance) pairs as each regional scan finishes.
+
+        Same filtering as list_ec2_instances, but nothing is merged into one
+        account-wide dict, so callers can stream results out as they arrive.
+        """
+        futures = self._submit_region_scans(filters, regions or self._get_all_regions(), minimal)
+        regions_by_future = {future: region for region, future in futures.items()}
+
+        for future in as_completed(regions_by_future):
+            region = regions_by_future.pop(future)
+            try:
+                instances = future.result()
             except ClientError as e:
-                print(f'Error listing EC2 instances in {region}: {str(e)}')
+                logger.warning('Error listing EC2 instances in %s: %s', region, e)
                 continue
+            for instance in instances:
+                yield region, instance
 
-        return all_instances
+    async def list_ec2_instances_async(self, filters: List[Dict[str, Any]] = None, regions: List[str] = None,
+                                       minimal: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """Async variant of list_ec2_instances for use from the event loop.
+
+        The regional scans run on the same pool, but the caller awaits them
+        directly instead of parking a worker thread on their results.
+        """
+        if not regions:
+            regions = await asyncio.to_thread(self._get_all_regions)
+        futures = self._submit_region_scans(filters, regions, minimal)
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in futures.values()),
+            return_exceptions=True
+        )
+
+        outcomes = {}
+        for region, result in zip(futures, results):
+            if isinstance(result, Exception) and not isinstance(result, ClientError):
+                raise result
+            outcomes[region] = result
+        return self._collect_region_scans(outcomes)
+
+    async def iter_ec2_regions_async(self, filters: List[Dict[str, Any]] = None, regions: List[str] = None,
+                                     minimal: bool = False) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Yield (region, instances) for each region with instances, as its scan finishes.
+
+        Same filtering as list_ec2_instances; regions that fail or come back
+        empty are skipped.
+        """
+        if not regions:
+            regions = await asyncio.to_thread(self._get_all_regions)
+        futures = self._submit_region_scans(filters, regions, minimal)
+
+        async def scan(region, future):
+            try:
+                return region, await asyncio.wrap_future(future)
+            except ClientError as e:
+                return region, e
+
+        for next_done in asyncio.as_completed([scan(region, future) for region, future in futures.items()]):
+            region, outcome = await next_done
+            for region, instances in self._collect_region_scans({region: outcome}).items():
+                yield region, instances
 
-    def list_s3_buckets(self) -> Dict[str, Any]:
-        """List all S3 buckets with their region information"""
+    def _bucket_storage_metrics(self, bucket_name: str, region: str):
+        """Read a bucket's size and object count from the daily S3 CloudWatch metrics.
+
+        One call per metric instead of listing every object. The metrics are
+        published once a day, so the latest datapoint of the last two days is used.
+        Returns None for a value CloudWatch has no datapoint for yet.
+        """
+        cloudwatch = self._client('cloudwatch', region)
+        end_time = datetime.datetime.utcnow()
+        start_time = end_time - datetime.timedelta(days=2)
+
+        def latest(metric_name: str, storage_type: str) -> Optional[int]:
+            response = cloudwatch.get_metric_statistics(
+                Namespace='AWS/S3',
+                MetricName=metric_name,
+                Dimensions=[
+                    {'Name': 'BucketName', 'Value': bucket_name},
+                    {'Name': 'StorageType', 'Value': storage_type}
+                ],
+                StartTime=start_time,
+                EndTime=end_time,
+                Period=86400,
+                Statistics=['Average']
+            )
+            datapoints = response.get('Datapoints', [])
+            if not datapoints:
+                return None
+            return int(max(datapoints, key=lambda d: d['Timestamp'])['Average'])
+
+        return latest('BucketSizeBytes', 'StandardStorage'), latest('NumberOfObjects', 'AllStorageTypes')
+
+    def _bucket_inventory_totals(self, s3, bucket_name: str) -> Optional[Tuple[int, int]]:
+        """Sum size and object count from the bucket's latest CSV S3 Inventory report.
+
+        Returns None when the bucket has no CSV inventory configured or no
+        report has been delivered yet. Reading the report costs a handful of
+        GETs, regardless of how many objects the bucket holds.
+        """
         try:
-            s3 = self.session.client('s3')
+            configurations = s3.list_bucket_inventory_configurations(Bucket=bucket_name)
+        except ClientError:
+            return None
+        for configuration in configurations.get('InventoryConfigurationList', []):
+            destination = configuration['Destination']['S3BucketDestination']
+            if not configuration.get('IsEnabled') or destination['Format'] != 'CSV':
+                continue
+
+            target_bucket = destination['Bucket'].split(':::')[-1]
+            prefix = '/'.join(p for p in (destination.get('Prefix'), bucket_name, configuration['Id']) if p) + '/'
+            try:
+                # Reports are delivered under timestamped folders; the newest sorts last
+                listing = s3.list_objects_v2(Bucket=target_bucket, Prefix=prefix, Delimiter='/')
+                folders = sorted(
+                    p['Prefix'] for p in listing.get('CommonPrefixes', [])
+                    if p['Prefix'][len(prefix):len(prefix) + 1].isdigit()
+                )
+                if not folders:
+                    continue
+                manifest = json.loads(
+                    s3.get_object(Bucket=target_bucket, Key=folders[-1] + 'manifest.json')['Body'].read()
+                )
+                schema = [field.strip() for field in manifest['fileSchema'].split(',')]
+                if 'Size' not in schema:
+                    continue
+                size_column = schema.index('Size')
+
+                size = count = 0
+                for report in manifest['files']:
+                    body = s3.get_object(Bucket=target_bucket, Key=report['key'])['Body']
+                    with gzip.open(body, mode='rt', newline='') as rows:
+                        for row in csv.reader(rows):
+                            if len(row) > size_column and row[size_column]:
+                                size += int(row[size_column])
+                                count += 1
+                return size, count
+            except (ClientError, KeyError, ValueError, OSError):
+                continue
+        return None
+
+    def _scan_bucket_objects(self, bucket_name: str, region: str, max_keys: int = None):
+        """Compute a bucket's size and object count by listing its objects.
+
+        Exact unless `max_keys` is given, in which case listing stops after
+        that many objects.
+        """
+        s3_regional = self._client('s3', region)
+        size = count = 0
+        paginator = s3_regional.get_paginator('list_objects_v2')
+        pages = paginator.paginate(Bucket=bucket_name, PaginationConfig={'PageSize': 1000, 'MaxItems': max_keys})
+        # Reduce each page in one pass; len() gives the count without a second loop
+        for page in pages:
+            contents = page.get('Contents')
+            if contents:
+                size += sum(obj['Size'] for obj in contents)
+                count += len(contents)
+        return size, count
+
+    def _describe_bucket(self, s3, bucket: Dict[str, Any], deep_scan: bool = False):
+        """Collect region, size, tags, versioning and encryption for one bucket.
+
+        Returns (region, bucket_info, errors). Raises ClientError if the bucket's
+        location can't be read at all.
+        """
+        bucket_name = bucket['Name']
+        errors = []
+
+        # Get bucket location (region); recent ListBuckets responses carry it as
+        # BucketRegion, so GetBucketLocation is only needed for older endpoints
+        region = self._bucket_region_cache.get(bucket_name) or bucket.get('BucketRegion')
+        if region is None:
+            location = s3.get_bucket_location(Bucket=bucket_name)
+            region = location['LocationConstraint'] or 'us-east-1'  # None means us-east-1
+        self._bucket_region_cache[bucket_name] = region
+        
+        # Initialize bucket info
+        bucket_info = {
+            'Name': bucket_name,
+            'CreationDate': bucket['CreationDate'],
+            'Region': region,
+            'Size': 0,
+            'ObjectCount': 0,
+            'Tags': {},
+            'Versioning': 'Unknown',
+            'Encryption': 'Unknown',
+            'AccessStatus': 'Full'
+        }
+
+        # The size, tag, versioning and encryption lookups are independent, so
+        # run them concurrently. Each returns an error entry or None.
+        def fetch_size():
+            try:
+                if deep_scan:
+                    size, count = self._scan_bucket_objects(bucket_name, region)
+                    bucket_info['SizeSource'] = 'scan'
+                else:
+                    size, count = self._bucket_storage_metrics(bucket_name, region)
+                    bucket_info['SizeSource'] = 'cloudwatch'
+                    if size is None and count is None:
+                        # No metrics yet: try the latest S3 Inventory report, then
+                        # fall back to a bounded listing
+                        totals = self._bucket_inventory_totals(s3, bucket_name)
+                        if totals is not None:
+                            size, count = totals
+                            bucket_info['SizeSource'] = 'inventory'
+                        else:
+                            size, count = self._scan_bucket_objects(bucket_name, region, max_keys=SAMPLE_MAX_KEYS)
+                            bucket_info['SizeSource'] = 'sample'
+                bucket_info['Size'] = size or 0
+                bucket_info['ObjectCount'] = count or 0
+            except ClientError as e:
+                return {
+                    'bucket': bucket_name,
+                    'operation': 'list_objects' if deep_scan else 'get_metric_statistics',
+                    'error': str(e)
+                }
+
+        def fetch_tags():
+            try:
+                tags_response = s3.get_bucket_tagging(Bucket=bucket_name)
+                bucket_info['Tags'] = {tag['Key']: tag['Value'] for tag in tags_response.get('TagSet', [])}
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'NoSuchTagSet':
+                    return {
+                        'bucket': bucket_name,
+                        'operation': 'get_bucket_tagging',
+                        'error': str(e)
+                    }
+
+        def fetch_versioning():
+            try:
+                versioning = s3.get_bucket_versioning(Bucket=bucket_name)
+                bucket_info['Versioning'] = versioning.get('Status', 'Disabled')
+            except ClientError as e:
+                return {
+                    'bucket': bucket_name,
+                    'operation': 'get_bucket_versioning',
+                    'error': str(e)
+                }
+
+        def fetch_encryption():
+            try:
+                s3.get_bucket_encryption(Bucket=bucket_name)
+                bucket_info['Encryption'] = 'Enabled'
+            except ClientError as e:
+                bucket_info['Encryption'] = 'Disabled'
+                if e.response['Error']['Code'] != 'ServerSideEncryptionConfigurationNotFoundError':
+                    return {
+                        'bucket': bucket_name,
+                        'operation': 'get_bucket_encryption',
+                        'error': str(e)
+                    }
+
+        futures = [
+            self._metadata_executor.submit(fetch)
+            for fetch in (fetch_size, fetch_tags, fetch_versioning, fetch_encryption)
+        ]
+        for future in futures:
+            error = future.result()
+            if error:
+                bucket_info['AccessStatus'] = 'Limited'
+                errors.append(error)
+
+        return region, bucket_info, errors
+
+    def list_s3_buckets(self, deep_scan: bool = False) -> Dict[str, Any]:
+        """List all S3 buckets with their region information.
+
+        Sizes and object counts come from CloudWatch storage metrics (up to a
+        day old, Standard storage size only); pass deep_scan=True to list every
+        object for exact figures instead.
+        """
+        try:
+            s3 = self._client('s3')
             response = s3.list_buckets()
             buckets_by_region = {}
             errors = []
@@ -93,81 +552,16 @@ class AWSClient:
                     "data": {}
                 }
 
-            for bucket in response['Buckets']:
-                bucket_name = bucket['Name']
-                try:
-                    # Get bucket location (region)
-                    location = s3.get_bucket_location(Bucket=bucket_name)
-                    region = location['LocationConstraint'] or 'us-east-1'  # None means us-east-1
-                    
-                    # Initialize bucket info
-                    bucket_info = {
-                        'Name': bucket_name,
-                        'CreationDate': bucket['CreationDate'].isoformat(),
-                        'Region': region,
-                        'Size': 0,
-                        'ObjectCount': 0,
-                        'Tags': {},
-                        'Versioning': 'Unknown',
-                        'Encryption': 'Unknown',
-                        'AccessStatus': 'Full'
-                    }
+            # Describe buckets concurrently, then merge in listing order
+            futures = [
+                (bucket['Name'], self._executor.submit(self._throttled, self._describe_bucket, s3, bucket, deep_scan))
+                for bucket in response['Buckets']
+            ]
 
-                    # Get bucket size and object count
-                    try:
-                        s3_regional = self.session.client('s3', region_name=region)
-                        paginator = s3_regional.get_paginator('list_objects_v2')
-                        for page in paginator.paginate(Bucket=bucket_name):
-                            if 'Contents' in page:
-                                for obj in page['Contents']:
-                                    bucket_info['Size'] += obj['Size']
-                                    bucket_info['ObjectCount'] += 1
-                    except ClientError as e:
-                        bucket_info['AccessStatus'] = 'Limited'
-                        errors.append({
-                            'bucket': bucket_name,
-                            'operation': 'list_objects',
-                            'error': str(e)
-                        })
-
-                    # Get bucket tags
-                    try:
-                        tags_response = s3.get_bucket_tagging(Bucket=bucket_name)
-                        bucket_info['Tags'] = {tag['Key']: tag['Value'] for tag in tags_response.get('TagSet', [])}
-                    except ClientError as e:
-                        if e.response['Error']['Code'] != 'NoSuchTagSet':
-                            bucket_info['AccessStatus'] = 'Limited'
-                            errors.append({
-                                'bucket': bucket_name,
-                                'operation': 'get_bucket_tagging',
-                                'error': str(e)
-                            })
-
-                    # Get bucket versioning status
-                    try:
-                        versioning = s3.get_bucket_versioning(Bucket=bucket_name)
-                        bucket_info['Versioning'] = versioning.get('Status', 'Disabled')
-                    except ClientError as e:
-                        bucket_info['AccessStatus'] = 'Limited'
-                        errors.append({
-                            'bucket': bucket_name,
-                            'operation': 'get_bucket_versioning',
-                            'error': str(e)
-                        })
-
-                    # Get bucket encryption
-                    try:
-                        encryption = s3.get_bucket_encryption(Bucket=bucket_name)
-                        bucket_info['Encryption'] = 'Enabled'
-                    except ClientError as e:
-                        if e.response['Error']['Code'] != 'ServerSideEncryptionConfigurationNotFoundError':
-                            bucket_info['AccessStatus'] = 'Limited'
-                            errors.append({
-                                'bucket': bucket_name,
-                                'operation': 'get_bucket_encryption',
-                                'error': str(e)
-                            })
-                        bucket_info['Encryption'] = 'Disabled'
+            for bucket_name, future in futures:
+                try:
+                    region, bucket_info, bucket_errors = future.result()
+                    errors.extend(bucket_errors)
 
                     if region not in buckets_by_region:
                         buckets_by_region[region] = []
@@ -210,101 +604,130 @@ class AWSClient:
     def get_cost_and_usage(self, start_date: str, end_date: str) -> Dict[str, Any]:
         """Get AWS cost and usage data for a specific time period"""
         try:
-            ce = self.session.client('ce', region_name='us-east-1')  # Cost Explorer is only available in us-east-1
+            ce = self._client('ce', 'us-east-1')  # Cost Explorer is only available in us-east-1
             
-            # Get costs grouped by service and region
-            response = ce.get_cost_and_usage(
-                TimePeriod={
+            request = {
+                'TimePeriod': {
                     'Start': start_date,
                     'End': end_date
                 },
-                Granularity='DAILY',
-                Metrics=['UnblendedCost'],
-                GroupBy=[
+                # The response is summed per service/region below, so let Cost
+                # Explorer pre-aggregate per month instead of returning every day
+                'Granularity': 'MONTHLY',
+                'Metrics': ['UnblendedCost'],
+                'GroupBy': [
                     {'Type': 'DIMENSION', 'Key': 'SERVICE'},
                     {'Type': 'DIMENSION', 'Key': 'REGION'}
                 ]
-            )
-
-            # Process the results
-            costs_by_service = {}
-            costs_by_location = {}
-            total_cost = 0
-
-            for result in response['ResultsByTime']:
-                for group in result['Groups']:
-                    service = group['Keys'][0]
-                    location = group['Keys'][1] or 'global'  # Some services are global
-                    cost = float(group['Metrics']['UnblendedCost']['Amount'])
+            }
 
-                    costs_by_service[service] = costs_by_service.get(service, 0) + cost
-                    costs_by_location[location] = costs_by_location.get(location, 0) + cost
-                    total_cost += cost
+            # Flatten every page into (period, service, location, cost) rows once,
+            # then reduce the rows instead of re-walking the nested response
+            rows = []
+            while True:
+                response = ce.get_cost_and_usage(**request)
+                rows.extend(
+                    (
+                        result['TimePeriod']['Start'],
+                        group['Keys'][0],
+                        group['Keys'][1] or 'global',  # Some services are global
+                        float(group['Metrics']['UnblendedCost']['Amount'])
+                    )
+                    for result in response['ResultsByTime']
+                    for group in result['Groups']
+                )
+                token = response.get('NextPageToken')
+                if not token:
+                    break
+                request['NextPageToken'] = token
+
+            costs_by_service = defaultdict(float)
+            costs_by_location = defaultdict(float)
+            costs_by_period = defaultdict(float)
+            for period, service, location, cost in rows:
+                costs_by_service[service] += cost
+                costs_by_location[location] += cost
+                costs_by_period[period] += cost
 
             return {
                 'timeframe': f"{start_date} to {end_date}",
                 'startDate': start_date,
                 'endDate': end_date,
                 'currency': 'USD',
-                'totalCost': total_cost,
-                'costsByService': costs_by_service,
-                'costsByLocation': costs_by_location
+                'totalCost': sum(costs_by_period.values()),
+                'costsByService': dict(costs_by_service),
+                'costsByLocation': dict(costs_by_location),
+                'costsByPeriod': dict(costs_by_period)
             }
 
         except ClientError as e:
             raise Exception(f'Error getting cost and usage data: {str(e)}')
 
-    def describe_service_status(self, service_name: str) -> Dict[str, Any]:
-        """Get the current status and health of an AWS service"""
+    @ttl_cache(ttl=60)
+    def _open_health_events(self, service_names: Tuple[str, ...]) -> Dict[str, List[Dict[str, Any]]]:
+        """Open and upcoming Health events for the given services, keyed by service"""
+        health = self._client('health', 'us-east-1')  # The Health API's global endpoint
+        paginator = health.get_paginator('describe_events')
+        pages = paginator.paginate(
+            filter={
+                'services': list(service_names),
+                'eventStatusCodes': ['open', 'upcoming']
+            }
+        )
+
+        events = {service: [] for service in service_names}
+        for event in (e for page in pages for e in page['events']):
+            events.setdefault(event['service'], []).append(event)
+        return events
+
+    def describe_service_status(self, service_names: Union[str, List[str]]) -> Any:
+        """Get the current status and health of one or more AWS services.
+
+        All services are fetched with a single paginated DescribeEvents call and
+        reused for 60 seconds. A single name returns that service's events; a
+        list returns events keyed by service.
+        """
+        names = [service_names] if isinstance(service_names, str) else service_names
         try:
-            health = self.session.client('health')
-            response = health.describe_events(
-                filter={
-                    'services': [service_name],
-                    'eventStatusCodes': ['open', 'upcoming']
-                }
-            )
-            return response['events']
+            events = self._open_health_events(tuple(sorted(set(names))))
         except ClientError as e:
             raise Exception(f'Error getting service status: {str(e)}')
+        if isinstance(service_names, str):
+            return events[service_names]
+        return {name: events[name] for name in names}
 
-    def get_cloudwatch_metrics(self, resource_id: str, metric_name: str,
-                             start_time: datetime, end_time: datetime) -> List[Dict[str, Any]]:
-        """Get CloudWatch metrics for a specific resource.
+    def get_metric_data(self, queries: List[Dict[str, str]], start_time: datetime,
+                        end_time: datetime, region: str = None) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """Get EC2 CloudWatch metrics for many instances in batched calls.
         
         Args:
-            resource_id: AWS resource ID (e.g., i-1234567890abcdef0 for EC2)
-            metric_name: Name of the metric to retrieve
+            queries: Dicts with 'resource_id' and 'metric_name' keys
             start_time: Start time for metrics
             end_time: End time for metrics
+            region: Region the instances live in (defaults to the session region)
             
         Returns:
-            List of metric data points
+            Data points keyed by resource ID, then metric name
         """
         try:
-            # Extract region from resource ID if possible, otherwise use default
-            region = self.session.region_name
-            if resource_id.startswith('i-'):  # EC2 instance
-                ec2 = self.session.client('ec2')
-                response = ec2.describe_instances(InstanceIds=[resource_id])
-                if response['Reservations']:
-                    region = response['Reservations'][0]['Instances'][0]['Placement']['AvailabilityZone'][:-1]
-
-            cloudwatch = self.session.client('cloudwatch', region_name=region)
-            
-            # Get the metric data
-            response = cloudwatch.get_metric_data(
-                MetricDataQueries=[
+            cloudwatch = self._client('cloudwatch', region)
+            paginator = cloudwatch.get_paginator('get_metric_data')
+            metrics = {}
+
+            # GetMetricData accepts up to 500 queries per request
+            for offset in range(0, len(queries), 500):
+                batch = queries[offset:offset + 500]
+                metric_queries = [
                     {
-                        'Id': 'm1',
+                        'Id': f'm{i}',
                         'MetricStat': {
                             'Metric': {
                                 'Namespace': 'AWS/EC2',
-                                'MetricName': metric_name,
+                                'MetricName': q['metric_name'],
                                 'Dimensions': [
                                     {
                                         'Name': 'InstanceId',
-                                        'Value': resource_id
+                                        'Value': q['resource_id']
                                     }
                                 ]
                             },
@@ -312,24 +735,88 @@ class AWSClient:
                             'Stat': 'Average'
                         }
                     }
-                ],
-                StartTime=start_time,
-                EndTime=end_time
-            )
-
-            # Process the results
-            metrics = []
-            timestamps = response['MetricDataResults'][0]['Timestamps']
-            values = response['MetricDataResults'][0]['Values']
+                    for i, q in enumerate(batch)
+                ]
 
-            for timestamp, value in zip(timestamps, values):
-                metrics.append({
-                    'timestamp': timestamp.isoformat(),
-                    'value': value,
-                    'unit': 'Percent' if metric_name in ['CPUUtilization'] else 'Count'
-                })
+                for page in paginator.paginate(MetricDataQueries=metric_queries, StartTime=start_time, EndTime=end_time):
+                    for result in page['MetricDataResults']:
+                        q = batch[int(result['Id'][1:])]
+                        unit = EC2_METRIC_UNITS.get(q['metric_name'], 'Count')
+                        points = metrics.setdefault(q['resource_id'], {}).setdefault(q['metric_name'], [])
+                        points.extend(
+                            {'timestamp': timestamp, 'value': value, 'unit': unit}
+                            for timestamp, value in zip(result['Timestamps'], result['Values'])
+                        )
 
             return metrics
 
         except ClientError as e:
             raise Exception(f'Error getting CloudWatch metrics: {str(e)}')
+
+    def get_cloudwatch_metrics_batch(self, resource_ids: List[str], metric_name: str,
+                                     start_time: datetime, end_time: datetime,
+                                     region: str = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Get one CloudWatch metric for many EC2 instances in the same region.
+        
+        Args:
+            resource_ids: EC2 instance IDs
+            metric_name: Name of the metric to retrieve
+            start_time: Start time for metrics
+            end_time: End time for metrics
+            region: Region the instances live in (defaults to the session region)
+            
+        Returns:
+            Metric data points keyed by instance ID
+        """
+        metrics = self.get_metric_data(
+            [{'resource_id': resource_id, 'metric_name': metric_name} for resource_id in resource_ids],
+            start_time,
+            end_time,
+            region=region
+        )
+        return {
+            resource_id: metrics.get(resource_id, {}).get(metric_name, [])
+            for resource_id in resource_ids
+        }
+
+    def _resolve_instance_regions(self, instance_ids: List[str]) -> Dict[str, str]:
+        """Find the regions of instances missing from the region cache.
+
+        All unknown IDs share a single instance-id filtered scan across regions,
+        which also fills the cache.
+        """
+        missing = [i for i in instance_ids if i not in self._instance_region_cache]
+        if missing:
+            self.list_ec2_instances(filters=[{'Name': 'instance-id', 'Values': missing}])
+        return {i: self._instance_region_cache[i] for i in instance_ids if i in self._instance_region_cache}
+
+    def get_cloudwatch_metrics(self, resource_id: str, metric_name: str,
+                             start_time: datetime, end_time: datetime,
+                             region: str = None) -> List[Dict[str, Any]]:
+        """Get CloudWatch metrics for a specific resource.
+        
+        Args:
+            resource_id: EC2 instance ID or ARN (e.g., i-1234567890abcdef0)
+            metric_name: Name of the metric to retrieve
+            start_time: Start time for metrics
+            end_time: End time for metrics
+            region: Region the resource lives in, if known
+            
+        Returns:
+            List of metric data points
+        """
+        # An ARN carries its region: arn:aws:ec2:<region>:<account>:instance/<id>
+        if resource_id.startswith('arn:'):
+            arn = resource_id.split(':', 5)
+            region = region or arn[3]
+            resource_id = arn[5].rsplit('/', 1)[-1]
+
+        # Otherwise resolve it from the listing cache, scanning regions on a miss
+        if region is None:
+            try:
+                region = self._resolve_instance_regions([resource_id]).get(resource_id)
+            except ClientError as e:
+                raise Exception(f'Error getting CloudWatch metrics: {str(e)}')
+        region = region or self.session.region_name
+
+        return self.get_cloudwatch_metrics_batch([resource_id], metric_name, start_time, end_time, region=region)[resource_id]
@@ -1,19 +1,179 @@
 import os
+import asyncio
+import itertools
 import logging
-from azure.identity import ClientSecretCredential
+import random
+import threading
+import time
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from azure.core.pipeline.policies import SansIOHTTPPolicy
+from azure.core.pipeline.transport import RequestsTransport
+from azure.identity import ClientSecretCredential, TokenCachePersistenceOptions
 from azure.mgmt.compute import ComputeManagementClient
 from azure.mgmt.storage import StorageManagementClient
 from azure.mgmt.costmanagement import CostManagementClient
 from azure.mgmt.resource import ResourceManagementClient, SubscriptionClient
 from azure.mgmt.monitor import MonitorManagementClient
+from azure.mgmt.resourcegraph import ResourceGraphClient
+from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
 from azure.storage.blob import BlobServiceClient
 from azure.core.exceptions import AzureError, ResourceNotFoundError
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 from datetime import datetime, timezone, timedelta
 
-logging.basicConfig(level=logging.INFO)
+from app.services.cache import succeeded, ttl_cache
+
 logger = logging.getLogger(__name__)
 
+ARM_ENDPOINT = 'https://management.azure.com'
+ARM_SCOPE = f'{ARM_ENDPOINT}/.default'
+# ARM's /batch endpoint accepts at most 20 sub-requests per call
+ARM_BATCH_SIZE = 20
+ARM_BATCH_POLL_TIMEOUT = 30  # seconds to wait on an asynchronously completing /batch call
+# metrics:getBatch takes up to 50 resources of one type in one region per call
+METRICS_BATCH_SIZE = 50
+METRICS_SCOPE = 'https://metrics.monitor.azure.com/.default'
+
+# Subscription access is checked at most once an hour per subscription,
+# however many clients are built
+SETUP_CHECK_TTL = 3600
+_setup_checked_at: Dict[str, float] = {}
+
+class QuotaAwarePolicy(SansIOHTTPPolicy):
+    """Slow down before ARM or Resource Graph start answering with 429s.
+
+    Resource Graph reports its per-user quota in x-ms-user-quota-remaining
+    and x-ms-user-quota-resets-after (hh:mm:ss); ARM reports the
+    subscription's remaining reads in x-ms-ratelimit-remaining-subscription-reads.
+    When either runs low the calling thread sleeps (with +/-20% jitter) so
+    the quota can refill, instead of falling into the SDK's retry backoff.
+    """
+
+    # ARM refills subscription reads continuously; a short pause is enough
+    ARM_LOW_READS = 10
+    ARM_PAUSE = 1.0
+
+    def on_response(self, request, response):
+        headers = response.http_response.headers
+        delay = 0.0
+
+        remaining = headers.get('x-ms-user-quota-remaining')
+        resets_after = headers.get('x-ms-user-quota-resets-after')
+        if remaining is not None and resets_after and int(remaining) < 2:
+            hours, minutes, seconds = resets_after.split(':')
+            window = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+            delay = window / max(1, int(remaining))
+
+        reads = headers.get('x-ms-ratelimit-remaining-subscription-reads')
+        if reads is not None and int(reads) < self.ARM_LOW_READS:
+            delay = max(delay, self.ARM_PAUSE)
+
+        if delay:
+            delay *= random.uniform(0.8, 1.2)
+            logger.warning('Azure read quota running low, pausing %.1fs', delay)
+            time.sleep(delay)
+
+# Cost Management query for get_cost_analysis; only the time period varies per call
+COST_QUERY_TEMPLATE = {
+    'type': 'ActualCost',
+    'timeframe': 'Custom',
+    'dataset': {
+        'granularity': 'Daily',
+        'aggregation': {
+            'totalCost': {
+                'name': 'Cost',
+                'function': 'Sum'
+            }
+        },
+        'grouping': [
+            {'type': 'Dimension', 'name': 'ServiceName'},
+            {'type': 'Dimension', 'name': 'ResourceLocation'},
+            {'type': 'Dimension', 'name': 'ResourceId'}
+        ]
+    }
+}
+
+def _rg_from_id(resource_id: str) -> str:
+    """Resource group of an ARM ID (/subscriptions/<sub>/resourceGroups/<rg>/...), without splitting it all"""
+    start = resource_id.index('/', resource_id.index('/', 1) + 1)
+    start = resource_id.index('/', start + 1) + 1
+    end = resource_id.find('/', start)
+    return resource_id[start:end if end != -1 else None]
+
+class CachingTokenCredential:
+    """Token credential wrapper that hands out one cached AccessToken per scope set.
+
+    Management clients, ARM batch calls and Cost/Monitor REST calls all ask
+    for tokens; they share the cached token until 75% of its lifetime has
+    passed. A lock keeps concurrent callers from refreshing at the same time.
+    """
+
+    def __init__(self, credential: ClientSecretCredential):
+        self._credential = credential
+        self._tokens: Dict[Tuple[str, ...], Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs):
+        # Claims challenges (CAE) need a fresh token from the inner credential
+        if kwargs.get('claims'):
+            return self._credential.get_token(*scopes, **kwargs)
+        with self._lock:
+            cached = self._tokens.get(scopes)
+            now = time.time()
+            if cached is not None and now < cached[1]:
+                return cached[0]
+            token = self._credential.get_token(*scopes, **kwargs)
+            self._tokens[scopes] = (token, now + 0.75 * max(0, token.expires_on - now))
+            return token
+
+    def close(self) -> None:
+        self._credential.close()
+
+def _refresh_token_ahead(credential: CachingTokenCredential) -> None:
+    """Fetch an ARM token now and schedule the next fetch for when the cached one goes stale.
+
+    Requests therefore keep finding a fresh token in the cache instead of
+    refreshing it themselves.
+    """
+    try:
+        token = credential.get_token(ARM_SCOPE)
+        delay = max(60, 0.75 * (token.expires_on - time.time()))
+    except Exception as e:
+        logger.warning('Azure token refresh failed, retrying in 60s: %s', e)
+        delay = 60
+    timer = threading.Timer(delay, _refresh_token_ahead, args=(credential,))
+    timer.daemon = True
+    timer.start()
+
+@lru_cache(maxsize=32)
+def _credential(tenant_id: str, client_id: str, client_secret: str) -> CachingTokenCredential:
+    """Share one credential, and so one token cache, per service principal.
+
+    The ARM token is kept warm in the background so requests never wait on
+    the token endpoint. Set AZURE_TOKEN_CACHE_PERSIST=1 to also persist the
+    token cache to disk across restarts (unencrypted where no keyring exists).
+    """
+    options = {}
+    if os.getenv('AZURE_TOKEN_CACHE_PERSIST') == '1':
+        options['cache_persistence_options'] = TokenCachePersistenceOptions(
+            name='cloudwise',
+            allow_unencrypted_storage=True
+        )
+    credential = CachingTokenCredential(ClientSecretCredential(
+        tenant_id=tenant_id,
+        client_id=client_id,
+        client_secret=client_secret,
+        **options
+    ))
+    _refresh_token_ahead(credential)
+    return credential
+
 class AzureClient:
     def __init__(self, subscription_id: str = None):
         """Initialize Azure client with credentials and required clients.
@@ -41,41 +201,76 @@ class AzureClient:
         
         try:
             # Initialize credential
-            self.credential = ClientSecretCredential(
-                tenant_id=self.tenant_id,
-                client_id=self.client_id,
-                client_secret=self.client_secret
+            self.credential = _credential(self.tenant_id, self.client_id, self.client_secret)
+            
+            # Share one HTTP session across all management clients so they
+            # reuse pooled connections instead of each opening their own
+            self._session = requests.Session()
+            # Size the pool for the VM status fan-out so concurrent calls don't
+            # discard connections; the default keeps only 10 per host
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            self._session.mount('https://', adapter)
+            self._transport = RequestsTransport(
+                session=self._session,
+                session_owner=False,
+                connection_timeout=5,
+                read_timeout=30
             )
+            # Per-VM detail calls are network-bound, so fan them out; kept
+            # around 15 wide to avoid starving the shared connection pool
+            self._executor = ThreadPoolExecutor(max_workers=15, thread_name_prefix='azure-vm')
             
-            # Initialize service clients
-            self.subscription_client = SubscriptionClient(self.credential)
+            # Initialize service clients; they share one throttling-aware policy
+            self._quota_policy = QuotaAwarePolicy()
+            self.subscription_client = SubscriptionClient(
+                self.credential,
+                transport=self._transport,
+                per_call_policies=[self._quota_policy]
+            )
             self.compute_client = ComputeManagementClient(
                 credential=self.credential,
-                subscription_id=self.subscription_id
+                subscription_id=self.subscription_id,
+                transport=self._transport,
+                per_call_policies=[self._quota_policy]
             )
             self.storage_client = StorageManagementClient(
                 credential=self.credential,
-                subscription_id=self.subscription_id
+                subscription_id=self.subscription_id,
+                transport=self._transport,
+                per_call_policies=[self._quota_policy]
             )
             self.cost_client = CostManagementClient(
-                credential=self.credential
+                credential=self.credential,
+                transport=self._transport,
+                per_call_policies=[self._quota_policy]
             )
             self.resource_client = ResourceManagementClient(
                 credential=self.credential,
-                subscription_id=self.subscription_id
+                subscription_id=self.subscription_id,
+                transport=self._transport,
+                per_call_policies=[self._quota_policy]
             )
             self.monitor_client = MonitorManagementClient(
                 credential=self.credential,
-                subscription_id=self.subscription_id
+                subscription_id=self.subscription_id,
+                transport=self._transport,
+                per_call_policies=[self._quota_policy]
+            )
+            self.graph_client = ResourceGraphClient(
+                credential=self.credential,
+                transport=self._transport,
+                per_call_policies=[self._quota_policy]
             )
             
-            # Verify subscription access
-            self._verify_subscription()
-            
-            # Ensure resource group exists
-            self.ensure_resource_group_exists()
-            if not self.test_connection():
-                raise ValueError("Failed to connect to Azure. Please check your credentials.")
+            # Verify subscription access; a successful subscription lookup
+            # already proves connectivity. Nothing here needs the default
+            # resource group, so ensure_resource_group_exists() is left to
+            # callers that create resources in it.
+            checked_at = _setup_checked_at.get(self.subscription_id)
+            if checked_at is None or time.monotonic() - checked_at > SETUP_CHECK_TTL:
+                self._verify_subscription()
+                _setup_checked_at[self.subscription_id] = time.monotonic()
+            self._rg_ensured = False
 
         except Exception as e:
             logger.error(f'Error initializing Azure client: {str(e)}')
@@ -88,7 +283,7 @@ class AzureClient:
             next(self.subscription_client.subscriptions.list())
             return True
         except Exception as e:
-            logging.error(f"Azure connection test failed: {str(e)}")
+            logger.error('Azure connection test failed: %s', e)
             return False
 
     def _verify_subscription(self) -> None:
@@ -98,61 +293,202 @@ class AzureClient:
                        if s.subscription_id == self.subscription_id), None)
             if not sub:
                 raise ValueError(f'Subscription {self.subscription_id} not found or not accessible')
-            logger.info(f'Successfully connected to Azure subscription: {sub.display_name}')
+            logger.info('Successfully connected to Azure subscription: %s', sub.display_name)
         except Exception as e:
             logger.error(f'Error verifying subscription: {str(e)}')
             raise
 
     def ensure_resource_group_exists(self) -> None:
-        """Ensure the resource group exists, create if it doesn't."""
+        """Ensure the resource group exists, create if it doesn't. Checked once per client."""
+        if self._rg_ensured:
+            return
         try:
             self.resource_client.resource_groups.get(self.resource_group)
-            logger.info(f'Resource group {self.resource_group} exists')
-        except Exception:
-            logger.info(f'Creating resource group {self.resource_group}')
+            logger.info('Resource group %s exists', self.resource_group)
+        except ResourceNotFoundError:
+            logger.info('Creating resource group %s', self.resource_group)
             self.resource_client.resource_groups.create_or_update(
                 self.resource_group,
                 {"location": self.location}
             )
+        self._rg_ensured = True
     
-    def list_virtual_machines(self, resource_group: str = None) -> Dict[str, List[Dict[str, Any]]]:
+    def _query_resource_graph(self, query: str) -> List[Dict[str, Any]]:
+        """Run a Resource Graph query against this subscription, following skip tokens.
+
+        One query returns up to 1000 projected rows per page and draws on a
+        far larger throttling quota than per-resource ARM reads.
+        """
+        rows = []
+        skip_token = None
+        while True:
+            response = self.graph_client.resources(QueryRequest(
+                subscriptions=[self.subscription_id],
+                query=query,
+                options=QueryRequestOptions(skip_token=skip_token, top=1000, result_format='objectArray')
+            ))
+            rows.extend(response.data)
+            skip_token = response.skip_token
+            if not skip_token:
+                return rows
+
+    def _list_vm_rows(self, resource_group: str = None) -> List[Dict[str, Any]]:
+        """Query the VMs of the subscription (or one resource group) from Resource Graph"""
+        query = "Resources | where type =~ 'microsoft.compute/virtualmachines'"
+        if resource_group:
+            query += " | where resourceGroup =~ '{}'".format(resource_group.replace("'", "\\'"))
+        query += (
+            " | project id, name, location, tags,"
+            " vm_size = properties.hardwareProfile.vmSize,"
+            " os_type = properties.storageProfile.osDisk.osType,"
+            " provisioning_state = properties.provisioningState,"
+            " power_state = properties.extended.instanceView.powerState.code"
+        )
+        return self._query_resource_graph(query)
+
+    def _group_vms_by_region(self, vms: List[Dict[str, Any]], statuses=None) -> Dict[str, List[Dict[str, Any]]]:
+        """Group Resource Graph rows by region, attaching instance-view statuses if given"""
+        vms_by_region = defaultdict(list)
+        for vm, status in zip(vms, statuses if statuses is not None else itertools.repeat(None)):
+            vm_info = {
+                'name': vm['name'],
+                'id': vm['id'],
+                'vm_size': vm['vm_size'],
+                'os_type': vm['os_type'],
+                'provisioning_state': vm['provisioning_state'],
+                'resource_group': _rg_from_id(vm['id']),
+                'tags': vm['tags'] or {},
+                'power_state': vm.get('power_state')
+            }
+            if status is not None:
+                vm_info['status'] = status
+            
+            vms_by_region[vm['location']].append(vm_info)
+        return dict(vms_by_region)
+
+    def list_virtual_machines(self, resource_group: str = None, include_status: bool = False) -> Dict[str, List[Dict[str, Any]]]:
         """List Azure Virtual Machines grouped by region.
         
         Args:
             resource_group: Optional resource group name to filter VMs.
+            include_status: Also fetch each VM's full instance view as 'status'.
+                The power state is always included from the listing itself.
             
         Returns:
             Dict with regions as keys and list of VM details as values.
         """
         try:
-            vms_by_region = {}
-            if resource_group:
-                vm_list = self.compute_client.virtual_machines.list(resource_group_name=resource_group)
-            else:
-                vm_list = self.compute_client.virtual_machines.list_all()
-
-            for vm in vm_list:
-                vm_info = {
-                    'name': vm.name,
-                    'id': vm.id,
-                    'vm_size': vm.hardware_profile.vm_size,
-                    'os_type': vm.storage_profile.os_disk.os_type,
-                    'provisioning_state': vm.provisioning_state,
-                    'resource_group': vm.id.split('/')[4],
-                    'tags': vm.tags or {},
-                    'status': self.get_vm_status(vm.id.split('/')[4], vm.name)
-                }
-                
-                region = vm.location
-                if region not in vms_by_region:
-                    vms_by_region[region] = []
-                vms_by_region[region].append(vm_info)
-            
-            return vms_by_region
+            vms = self._list_vm_rows(resource_group)
+            if not include_status:
+                return self._group_vms_by_region(vms)
+            if not resource_group:
+                # One paged statusOnly listing covers the whole subscription
+                statuses = self._subscription_vm_statuses()
+                return self._group_vms_by_region(vms, self._statuses_for(vms, statuses))
+            # Fetch instance views through ARM batch requests, 20 VMs per call;
+            # every row is in the filtered group, so its ID needn't be parsed
+            statuses = self.get_vm_statuses_batch([(resource_group, vm['name']) for vm in vms])
+            return self._group_vms_by_region(vms, statuses)
         except Exception as e:
-            logger.error(f'Error listing Azure VMs: {str(e)}')
+            logger.error('Error listing Azure VMs: %s', e)
             raise
 
+    async def list_virtual_machines_async(self, resource_group: str = None,
+                                          include_status: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """Async variant of list_virtual_machines for use from the event loop.
+
+        The status batches run on the client's pool, but the caller awaits
+        them directly instead of parking a worker thread on their results.
+        """
+        try:
+            vms = await asyncio.to_thread(self._list_vm_rows, resource_group)
+            if not include_status:
+                return self._group_vms_by_region(vms)
+            if not resource_group:
+                statuses = await asyncio.to_thread(self._subscription_vm_statuses)
+                return self._group_vms_by_region(vms, self._statuses_for(vms, statuses))
+            statuses = await self.get_vm_statuses_async([(resource_group, vm['name']) for vm in vms])
+            return self._group_vms_by_region(vms, statuses)
+        except Exception as e:
+            logger.error('Error listing Azure VMs: %s', e)
+            raise
+
+    async def get_vm_statuses_async(self, vm_refs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Async variant of get_vm_statuses_batch, in the same order as the refs.
+
+        Every 20-VM batch is in flight at once (bounded by the client's pool),
+        so the wait is roughly one batch round trip rather than one per chunk.
+        A chunk that fails outright reports an error for each of its VMs.
+        """
+        chunks = [vm_refs[i:i + ARM_BATCH_SIZE] for i in range(0, len(vm_refs), ARM_BATCH_SIZE)]
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(self._executor.submit(self._vm_status_chunk, chunk)) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        statuses = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                statuses.extend({'error': str(result)} for _ in chunk)
+            else:
+                statuses.extend(result)
+        return statuses
+
+    def _format_instance_view(self, vm_name: str, instance_view, last_updated: str = None) -> Dict[str, Any]:
+        """Shape an SDK instance view into the VM status dict; batch callers pass one shared last_updated"""
+        return {
+            'vm_name': vm_name,
+            'statuses': [{
+                'code': status.code,
+                'level': status.level,
+                'display_status': status.display_status,
+                'message': status.message
+            } for status in (instance_view.statuses or [])],
+            'maintenance_state': instance_view.maintenance_state,
+            'last_updated': last_updated or datetime.now(timezone.utc).isoformat()
+        }
+
+    def _subscription_vm_statuses(self) -> Dict[str, Dict[str, Any]]:
+        """Instance-view statuses of every VM in the subscription, keyed by lower-cased ID.
+
+        list_all(status_only='true') returns the run-time status of all VMs
+        in one paged call instead of an instance-view request per VM.
+        """
+        last_updated = datetime.now(timezone.utc).isoformat()
+        return {
+            vm.id.lower(): self._format_instance_view(vm.name, vm.instance_view, last_updated)
+            for vm in self.compute_client.virtual_machines.list_all(status_only='true')
+            if vm.instance_view is not None
+        }
+
+    def _statuses_for(self, vms: List[Dict[str, Any]], statuses: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Line up subscription-wide statuses with Resource Graph rows"""
+        return [
+            statuses.get(vm['id'].lower(), {'error': 'No instance view returned for this VM'})
+            for vm in vms
+        ]
+
+    async def snapshot(self, timeframe: str = 'LastMonth') -> Dict[str, Any]:
+        """VMs, storage accounts, resource groups and costs, fetched concurrently.
+
+        The four calls are independent, so a dashboard waits for the slowest
+        of them rather than their sum. A failing part is reported under its
+        key as {'status': 'error', ...} instead of failing the whole snapshot.
+        """
+        keys = ('vms', 'storage', 'resource_groups', 'cost')
+        results = await asyncio.gather(
+            self.list_virtual_machines_async(),
+            asyncio.to_thread(self.list_storage_accounts),
+            asyncio.to_thread(self.list_resource_groups),
+            asyncio.to_thread(self.get_cost_analysis, timeframe),
+            return_exceptions=True
+        )
+        return {
+            key: {"status": "error", "message": str(result), "error": str(result)}
+            if isinstance(result, Exception) else result
+            for key, result in zip(keys, results)
+        }
+
     def get_vm_status(self, resource_group: str, vm_name: str) -> Dict[str, Any]:
         """Get detailed status of a specific Virtual Machine.
         
@@ -169,22 +505,98 @@ class AzureClient:
                 vm_name=vm_name
             )
             
-            status = {
+            return self._format_instance_view(vm_name, instance_view)
+        except Exception as e:
+            logger.error('Error getting VM status for %s: %s', vm_name, e)
+            return {'error': str(e)}
+
+    def _vm_status_batch(self, vm_refs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Fetch up to ARM_BATCH_SIZE instance views with one ARM /batch call"""
+        token = self.credential.get_token(ARM_SCOPE).token
+        headers = {'Authorization': f'Bearer {token}'}
+        body = {
+            'requests': [{
+                'name': str(i),
+                'httpMethod': 'GET',
+                'url': (
+                    f'/subscriptions/{self.subscription_id}/resourceGroups/{resource_group}'
+                    f'/providers/Microsoft.Compute/virtualMachines/{vm_name}/instanceView?api-version=2023-07-01'
+                )
+            } for i, (resource_group, vm_name) in enumerate(vm_refs)]
+        }
+
+        response = self._session.post(f'{ARM_ENDPOINT}/batch?api-version=2020-06-01', json=body, headers=headers, timeout=30)
+        # ARM may finish the batch asynchronously; poll the Location it hands
+        # back, giving up after ARM_BATCH_POLL_TIMEOUT so the caller falls back
+        deadline = time.monotonic() + ARM_BATCH_POLL_TIMEOUT
+        while response.status_code == 202:
+            delay = float(response.headers.get('Retry-After', 1))
+            if time.monotonic() + delay > deadline:
+                raise TimeoutError(f'ARM batch still pending after {ARM_BATCH_POLL_TIMEOUT}s')
+            time.sleep(delay)
+            response = self._session.get(response.headers['Location'], headers=headers, timeout=30)
+        response.raise_for_status()
+        replies = {reply['name']: reply for reply in response.json()['responses']}
+        last_updated = datetime.now(timezone.utc).isoformat()
+
+        statuses = []
+        for i, (resource_group, vm_name) in enumerate(vm_refs):
+            reply = replies.get(str(i), {})
+            content = reply.get('content') or {}
+            if reply.get('httpStatusCode') != 200:
+                error = content.get('error', {}).get('message') or f"HTTP {reply.get('httpStatusCode')}"
+                logger.error('Error getting VM status for %s: %s', vm_name, error)
+                statuses.append({'error': error})
+                continue
+            statuses.append({
                 'vm_name': vm_name,
                 'statuses': [{
-                    'code': status.code,
-                    'level': status.level,
-                    'display_status': status.display_status,
-                    'message': status.message
-                } for status in instance_view.statuses],
-                'maintenance_state': instance_view.maintenance_state,
-                'last_updated': datetime.now(timezone.utc).isoformat()
+                    'code': status.get('code'),
+                    'level': status.get('level'),
+                    'display_status': status.get('displayStatus'),
+                    'message': status.get('message')
+                } for status in content.get('statuses', [])],
+                'maintenance_state': content.get('maintenanceState'),
+                'last_updated': last_updated
+            })
+        return statuses
+
+    def _vm_status_chunk(self, vm_refs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """One batch of VM statuses, falling back to per-VM calls if the batch call fails"""
+        try:
+            return self._vm_status_batch(vm_refs)
+        except Exception as e:
+            logger.warning('ARM batch request failed, fetching VM statuses one by one: %s', e)
+            return [self.get_vm_status(resource_group, vm_name) for resource_group, vm_name in vm_refs]
+
+    def get_vm_statuses_batch(self, vm_refs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Get the status of many VMs, in the same order as the (resource_group, vm_name) refs.
+
+        Instance views are requested ARM_BATCH_SIZE at a time through ARM's
+        /batch endpoint, so N VMs cost N/20 round trips instead of N. A chunk
+        whose batch call fails falls back to per-VM get_vm_status calls.
+        """
+        chunks = [vm_refs[i:i + ARM_BATCH_SIZE] for i in range(0, len(vm_refs), ARM_BATCH_SIZE)]
+        return [status for statuses in self._executor.map(self._vm_status_chunk, chunks) for status in statuses]
+
+    def _blob_service_status(self, account: Dict[str, Any]) -> Dict[str, Any]:
+        """Blob service settings of a Resource Graph storage account row, or {'error': ...}"""
+        try:
+            blob_props = self.storage_client.blob_services.get_service_properties(
+                _rg_from_id(account['id']),
+                account['name']
+            )
+            return {
+                'cors_enabled': bool(blob_props.cors),
+                'delete_retention_enabled': bool(blob_props.delete_retention_policy),
+                'versioning_enabled': bool(blob_props.is_versioning_enabled)
             }
-            return status
         except Exception as e:
-            logger.error(f'Error getting VM status for {vm_name}: {str(e)}')
-            return {'error': str(e)}
+            return {
+                'error': str(e)
+            }
 
+    @ttl_cache(ttl=300, cache_if=succeeded)
     def list_storage_accounts(self) -> Dict[str, Any]:
         """List all storage accounts grouped by region with detailed information.
         
@@ -192,7 +604,12 @@ class AzureClient:
             Dict containing storage account details, status, and any errors encountered.
         """
         try:
-            accounts = list(self.storage_client.storage_accounts.list())
+            # One Resource Graph query returns every account as plain JSON in
+            # ARM's shape, up to 1000 per page
+            accounts = self._query_resource_graph(
+                "Resources | where type =~ 'microsoft.storage/storageaccounts'"
+                " | project id, name, location, type, kind, sku, tags, properties"
+            )
             if not accounts:
                 return {
                     "status": "empty",
@@ -200,95 +617,84 @@ class AzureClient:
                     "data": {}
                 }
 
-            accounts_by_region = {}
+            accounts_by_region = defaultdict(list)
             errors = []
             inaccessible_accounts = []
+
+            # Used capacity for every account, batched per region
+            end_time = datetime.now(timezone.utc)
+            try:
+                capacity = self.get_resource_metrics_batch(
+                    {account['id']: account['location'] for account in accounts},
+                    'UsedCapacity',
+                    end_time - timedelta(hours=24),
+                    end_time
+                )
+            except Exception as e:
+                logger.warning('Error getting storage account capacity: %s', e)
+                capacity = {}
+
+            # Blob service properties have no graph equivalent; fetch them for
+            # all accounts concurrently rather than one round trip at a time
+            blob_statuses = dict(zip(
+                (account['id'] for account in accounts),
+                self._executor.map(self._blob_service_status, accounts)
+            ))
             
             for account in accounts:
                 try:
-                    # Get account properties for more details
-                    properties = self.storage_client.storage_accounts.get_properties(
-                        account.id.split('/')[4],  # resource group
-                        account.name
-                    )
-                    
-                    # Get blob service properties
-                    try:
-                        blob_props = self.storage_client.blob_services.get_service_properties(
-                            account.id.split('/')[4],
-                            account.name
-                        )
-                        blob_status = {
-                            'cors_enabled': bool(blob_props.cors),
-                            'delete_retention_enabled': bool(blob_props.delete_retention_policy),
-                            'versioning_enabled': bool(blob_props.is_versioning_enabled)
-                        }
-                    except Exception as e:
-                        blob_status = {
-                            'error': str(e)
-                        }
-                    
-                    # Get account metrics
-                    try:
-                        metrics = self.get_resource_metrics(
-                            account.id,
-                            'UsedCapacity',
-                            datetime.now(timezone.utc) - timedelta(hours=24),
-                            datetime.now(timezone.utc)
-                        )
-                        latest_capacity = metrics[-1]['value'] if metrics else 0
-                    except Exception:
-                        latest_capacity = 0
+                    properties = account.get('properties', {})
+                    resource_group = _rg_from_id(account['id'])
+                    blob_status = blob_statuses[account['id']]
+                    account_metrics = capacity.get(account['id'].lower())
+                    latest_capacity = account_metrics[-1]['value'] if account_metrics else 0
 
+                    encryption = properties.get('encryption') or {}
+                    services = encryption.get('services') or {}
                     account_info = {
-                        'id': account.id,
-                        'name': account.name,
-                        'location': account.location,
-                        'resource_group': account.id.split('/')[4],
-                        'type': account.type,
-                        'sku': properties.sku.name,
-                        'kind': properties.kind,
-                        'access_tier': properties.access_tier,
-                        'provisioning_state': properties.provisioning_state,
-                        'creation_time': properties.creation_time.isoformat() if properties.creation_time else None,
-                        'primary_location': properties.primary_location,
-                        'status': properties.status_of_primary,
-                        'https_only': properties.enable_https_traffic_only,
+                        'id': account['id'],
+                        'name': account['name'],
+                        'location': account['location'],
+                        'resource_group': resource_group,
+                        'type': account.get('type'),
+                        'sku': (account.get('sku') or {}).get('name'),
+                        'kind': account.get('kind'),
+                        'access_tier': properties.get('accessTier'),
+                        'provisioning_state': properties.get('provisioningState'),
+                        'creation_time': properties.get('creationTime'),
+                        'primary_location': properties.get('primaryLocation'),
+                        'status': properties.get('statusOfPrimary'),
+                        'https_only': properties.get('supportsHttpsTrafficOnly'),
                         'encryption': {
-                            'key_source': properties.encryption.key_source,
+                            'key_source': encryption.get('keySource'),
                             'services': {
-                                'blob': properties.encryption.services.blob.enabled if properties.encryption.services.blob else False,
-                                'file': properties.encryption.services.file.enabled if properties.encryption.services.file else False,
-                                'table': properties.encryption.services.table.enabled if properties.encryption.services.table else False,
-                                'queue': properties.encryption.services.queue.enabled if properties.encryption.services.queue else False
+                                service: bool((services.get(service) or {}).get('enabled'))
+                                for service in ('blob', 'file', 'table', 'queue')
                             }
                         },
-                        'network_access': properties.network_rule_set.default_action if properties.network_rule_set else 'Allow',
+                        'network_access': (properties.get('networkAcls') or {}).get('defaultAction', 'Allow'),
                         'blob_service': blob_status,
                         'used_capacity_bytes': latest_capacity,
-                        'tags': account.tags or {}
+                        'tags': account.get('tags') or {}
                     }
                     
-                    region = account.location
-                    if region not in accounts_by_region:
-                        accounts_by_region[region] = []
-                    accounts_by_region[region].append(account_info)
+                    accounts_by_region[account['location']].append(account_info)
                     
                 except ResourceNotFoundError:
                     inaccessible_accounts.append({
-                        'account': account.name,
+                        'account': account['name'],
                         'reason': 'Account not found or insufficient permissions'
                     })
                 except Exception as e:
                     errors.append({
-                        'account': account.name,
+                        'account': account['name'],
                         'error': str(e)
                     })
             
             result = {
                 "status": "success" if accounts_by_region else "empty",
                 "message": "Storage accounts retrieved successfully" if accounts_by_region else "No accessible storage accounts found",
-                "data": accounts_by_region
+                "data": dict(accounts_by_region)
             }
             
             if errors:
@@ -314,6 +720,32 @@ class AzureClient:
                 "data": {}
             }
 
+    def _query_costs(self, scope: str, parameters: Dict[str, Any]) -> Tuple[List[str], List[List[Any]]]:
+        """Run a Cost Management query, returning (column names, rows) across all pages.
+
+        Posts to the REST endpoint directly and parses with orjson: the rows
+        are only read positionally, so deserialising them into SDK models
+        is wasted work on large subscriptions. Results over 5000 rows are
+        paged through nextLink.
+        """
+        headers = {'Authorization': f'Bearer {self.credential.get_token(ARM_SCOPE).token}'}
+        url = f'{ARM_ENDPOINT}{scope}/providers/Microsoft.CostManagement/query?api-version=2023-03-01'
+        column_names, rows = [], []
+        while url:
+            response = self._session.post(url, json=parameters, headers=headers, timeout=60)
+            response.raise_for_status()
+            properties = orjson.loads(response.content)['properties']
+            if not column_names:
+                column_names = [column['name'] for column in properties.get('columns', [])]
+            rows.extend(properties.get('rows', []))
+            url = properties.get('nextLink')
+        return column_names, rows
+
+    def invalidate_cost_cache(self) -> None:
+        """Drop cached cost analyses so the next call queries Cost Management again"""
+        self.get_cost_analysis.cache_clear()
+
+    @ttl_cache(ttl=300, cache_if=succeeded)
     def get_cost_analysis(self, timeframe: str = 'LastMonth') -> Dict[str, Any]:
         """Get cost analysis for the subscription with optimization recommendations.
         
@@ -332,49 +764,25 @@ class AzureClient:
             elif timeframe == 'LastWeek':
                 start_date = end_date - timedelta(days=7)
             else:
-                logger.warning(f'Invalid timeframe: {timeframe}, defaulting to LastMonth')
+                logger.warning('Invalid timeframe: %s, defaulting to LastMonth', timeframe)
                 start_date = end_date - timedelta(days=30)
             
-            logger.info(f'Getting cost analysis from {start_date} to {end_date}')
+            logger.info('Getting cost analysis from %s to %s', start_date, end_date)
             
             # Query parameters
             scope = f'/subscriptions/{self.subscription_id}'
             parameters = {
-                'type': 'ActualCost',
-                'timeframe': 'Custom',
+                **COST_QUERY_TEMPLATE,
                 'timePeriod': {
                     'from': start_date.strftime('%Y-%m-%dT%H:%M:%SZ'),
                     'to': end_date.strftime('%Y-%m-%dT%H:%M:%SZ')
-                },
-                'dataset': {
-                    'granularity': 'Daily',
-                    'aggregation': {
-                        'totalCost': {
-                            'name': 'Cost',
-                            'function': 'Sum'
-                        }
-                    },
-                    'grouping': [
-                        {
-                            'type': 'Dimension',
-                            'name': 'ServiceName'
-                        },
-                        {
-                            'type': 'Dimension',
-                            'name': 'ResourceLocation'
-                        },
-                        {
-                            'type': 'Dimension',
-                            'name': 'ResourceId'
-                        }
-                    ]
                 }
             }
             
             # Get cost data
-            cost_data = self.cost_client.query.usage(scope=scope, parameters=parameters)
+            column_names, rows = self._query_costs(scope, parameters)
             
-            if not cost_data.rows:
+            if not rows:
                 return {
                     "status": "empty",
                     "message": "No cost data available for the specified timeframe",
@@ -389,99 +797,122 @@ class AzureClient:
                 "data": {}
             }
 
-            
-            # Process cost data
-            result = {
-                'timeframe': f"{start_date.date()} to {end_date.date()}",
-                'startDate': start_date.isoformat(),
-                'endDate': end_date.isoformat(),
-                'currency': cost_data.columns[0].name,
-                'totalCost': 0.0,
-                'costsByService': {},
-                'costsByLocation': {},
-                'costsByResource': {},
-                'dailyCosts': [],
-                'optimization_recommendations': {
-                    'opportunities': [],
-                    'recommendations': [],
-                    'savings_estimates': []
-                }
+        # Rows follow the column list, e.g. [Cost, UsageDate, ServiceName,
+        # ResourceLocation, ResourceId, Currency]; look positions up by name
+        columns = {name: i for i, name in enumerate(column_names)}
+        cost_col = columns.get('Cost', 0)
+        date_col = columns.get('UsageDate')
+        service_col = columns.get('ServiceName')
+        location_col = columns.get('ResourceLocation')
+        resource_col = columns.get('ResourceId')
+        currency_col = columns.get('Currency')
+
+        # Process cost data
+        result = {
+            'timeframe': f"{start_date.date()} to {end_date.date()}",
+            'startDate': start_date.isoformat(),
+            'endDate': end_date.isoformat(),
+            'currency': rows[0][currency_col] if currency_col is not None else 'USD',
+            'totalCost': 0.0,
+            'costsByService': {},
+            'costsByLocation': {},
+            'costsByResource': {},
+            'dailyCosts': [],
+            'optimization_recommendations': {
+                'opportunities': [],
+                'recommendations': [],
+                'savings_estimates': []
             }
+        }
+
+        # Group costs
+        try:
+            # Rows are unique per (day, service, location, resource), so the
+            # per-row pass only sums cost per resource key and per day; the
+            # service and location totals come from the far smaller key set
+            key_cols = (resource_col, service_col, location_col)
+            if None in key_cols:
+                key_of = lambda row: tuple(row[i] if i is not None else None for i in key_cols)
+            else:
+                key_of = itemgetter(*key_cols)
+            day_of = itemgetter(date_col) if date_col is not None else (lambda row: None)
+
+            by_key = defaultdict(float)
+            by_day = defaultdict(float)
+            for row in rows:
+                cost = float(row[cost_col])
+                by_key[key_of(row)] += cost
+                by_day[day_of(row)] += cost
+            by_day.pop(None, None)
+
+            by_service = defaultdict(float)
+            by_location = defaultdict(float)
+            by_resource = {}
+            for (resource_id, service, location), cost in by_key.items():
+                service = service or 'Unknown'
+                location = location or 'Unknown'
+                by_service[service] += cost
+                by_location[location] += cost
+                resource = by_resource.get(resource_id or 'Unknown')
+                if resource is None:
+                    resource = by_resource[resource_id or 'Unknown'] = {
+                        'cost': 0.0,
+                        'service': service,
+                        'location': location
+                    }
+                resource['cost'] += cost
+
+            result['totalCost'] = sum(by_service.values())
+            result['costsByService'] = dict(by_service)
+            result['costsByLocation'] = dict(by_location)
+            result['costsByResource'] = by_resource
+            result['dailyCosts'] = [{'date': str(day), 'cost': cost} for day, cost in sorted(by_day.items())]
             
-            # Group costs
-            try:
-                for row in cost_data.rows:
-                    cost = float(row[0])
-                    service = row[1] or 'Unknown'
-                    location = row[2] or 'Unknown'
-                    resource_id = row[3] if len(row) > 3 else 'Unknown'
-                    
-                    result['totalCost'] += cost
-                    
-                    # By service
-                    if service not in result['costsByService']:
-                        result['costsByService'][service] = 0.0
-                    result['costsByService'][service] += cost
-                    
-                    # By location
-                    if location not in result['costsByLocation']:
-                        result['costsByLocation'][location] = 0.0
-                    result['costsByLocation'][location] += cost
-                    
-                    # By resource
-                    if resource_id not in result['costsByResource']:
-                        result['costsByResource'][resource_id] = {
-                            'cost': 0.0,
-                            'service': service,
-                            'location': location
-                        }
-                    result['costsByResource'][resource_id]['cost'] += cost
-                
-                # Generate optimization recommendations
-                opportunities = []
-                recommendations = []
-                savings_estimates = []
-                
-                # Analyze service costs
-                sorted_services = sorted(result['costsByService'].items(), key=lambda x: x[1], reverse=True)
-                if sorted_services:
-                    top_service = sorted_services[0]
-                    if top_service[1] > result['totalCost'] * 0.5:  # More than 50% of total cost
-                        opportunities.append(f"High {top_service[0]} costs ({top_service[1]:.2f} {result['currency']}) represent over 50% of total spend")
-                        recommendations.append(f"Review {top_service[0]} usage and consider:\n- Rightsizing resources\n- Using reserved instances\n- Implementing auto-scaling")
-                        savings_estimates.append(f"Potential {top_service[0]} savings: 10-30% through optimization")
-                
-                # Analyze location distribution
-                if len(result['costsByLocation']) > 1:
-                    opportunities.append("Resources distributed across multiple regions may increase data transfer costs")
-                    recommendations.append("Consider consolidating resources to fewer regions where possible")
-                
-                # Analyze resource costs
-                expensive_resources = [r for r in result['costsByResource'].items() if r[1]['cost'] > result['totalCost'] * 0.1]
-                if expensive_resources:
-                    opportunities.append(f"Found {len(expensive_resources)} resources each consuming >10% of total cost")
-                    for resource_id, details in expensive_resources:
-                        recommendations.append(f"Review resource {resource_id.split('/')[-1]} ({details['service']}) costing {details['cost']:.2f} {result['currency']}")
-                
-                result['optimization_recommendations']['opportunities'] = opportunities
-                result['optimization_recommendations']['recommendations'] = recommendations
-                result['optimization_recommendations']['savings_estimates'] = savings_estimates
-                
-                return {
-                    "status": "success",
-                    "message": "Cost analysis retrieved successfully",
-                    "data": result
-                }
-                
-            except Exception as e:
-                logger.error(f'Error processing cost data rows: {str(e)}')
-                return {
-                    "status": "error",
-                    "message": f"Error processing cost data: {str(e)}",
-                    "error": str(e),
-                    "data": {}
-                }
+            # Generate optimization recommendations
+            opportunities = []
+            recommendations = []
+            savings_estimates = []
+            
+            # Analyze service costs
+            sorted_services = sorted(result['costsByService'].items(), key=lambda x: x[1], reverse=True)
+            if sorted_services:
+                top_service = sorted_services[0]
+                if top_service[1] > result['totalCost'] * 0.5:  # More than 50% of total cost
+                    opportunities.append(f"High {top_service[0]} costs ({top_service[1]:.2f} {result['currency']}) represent over 50% of total spend")
+                    recommendations.append(f"Review {top_service[0]} usage and consider:\n- Rightsizing resources\n- Using reserved instances\n- Implementing auto-scaling")
+                    savings_estimates.append(f"Potential {top_service[0]} savings: 10-30% through optimization")
+            
+            # Analyze location distribution
+            if len(result['costsByLocation']) > 1:
+                opportunities.append("Resources distributed across multiple regions may increase data transfer costs")
+                recommendations.append("Consider consolidating resources to fewer regions where possible")
+            
+            # Analyze resource costs
+            expensive_resources = [r for r in result['costsByResource'].items() if r[1]['cost'] > result['totalCost'] * 0.1]
+            if expensive_resources:
+                opportunities.append(f"Found {len(expensive_resources)} resources each consuming >10% of total cost")
+                for resource_id, details in expensive_resources:
+                    recommendations.append(f"Review resource {resource_id.split('/')[-1]} ({details['service']}) costing {details['cost']:.2f} {result['currency']}")
+            
+            result['optimization_recommendations']['opportunities'] = opportunities
+            result['optimization_recommendations']['recommendations'] = recommendations
+            result['optimization_recommendations']['savings_estimates'] = savings_estimates
+            
+            return {
+                "status": "success",
+                "message": "Cost analysis retrieved successfully",
+                "data": result
+            }
             
+        except Exception as e:
+            logger.error('Error processing cost data rows: %s', e)
+            return {
+                "status": "error",
+                "message": f"Error processing cost data: {str(e)}",
+                "error": str(e),
+                "data": {}
+            }
+        
     def get_resource_metrics(self, resource_id: str, metric_name: str, 
                            start_time: datetime = None,
                            end_time: datetime = None) -> Dict[str, Any]:
@@ -578,45 +1009,68 @@ class AzureClient:
                 }
             }
 
-    def list_resource_groups(self) -> Dict[str, Any]:
-        """List all resource groups in the subscription with their properties.
-        
+    def get_resource_metrics_batch(self, resources: Dict[str, str], metric_name: str,
+                                   start_time: datetime, end_time: datetime) -> Dict[str, List[Dict[str, Any]]]:
+        """Get one metric for many resources through Azure Monitor's metrics:getBatch API.
+
+        Args:
+            resources: Resource ID -> region. Resources are grouped by region
+                and type and fetched METRICS_BATCH_SIZE per call.
+            metric_name: Name of the metric to retrieve
+            start_time: Start time for metrics
+            end_time: End time for metrics
+
         Returns:
-            Dict containing resource groups and their properties.
+            Hourly average data points keyed by lower-cased resource ID, in the
+            same {timestamp, value, unit} shape get_resource_metrics uses
         """
-        try:
-            groups = list(self.resource_client.resource_groups.list())
-            if not groups:
-                return {
-                    "status": "empty",
-                    "message": "No resource groups found in the subscription",
-                    "data": []
-                }
-            
-            result = [{
-                'id': group.id,
-                'name': group.name,
-                'location': group.location,
-                'tags': group.tags or {},
-                'provisioning_state': group.properties.provisioning_state,
-                'managed_by': group.managed_by
-            } for group in groups]
-            
-            return {
-                "status": "success",
-                "message": "Resource groups retrieved successfully",
-                "data": result
-            }
-            
-        except Exception as e:
-            logger.error(f'Error listing resource groups: {str(e)}')
-            return {
-                "status": "error",
-                "message": f"Error listing resource groups: {str(e)}",
-                "error": str(e),
-                "data": []
-            }
-            
+        groups = {}
+        for resource_id, region in resources.items():
+            # /subscriptions/<sub>/resourceGroups/<rg>/providers/<namespace>/<type>/<name>
+            parts = resource_id.split('/', 8)
+            namespace = f'{parts[6]}/{parts[7]}'
+            groups.setdefault((region, namespace), []).append(resource_id)
+
+        headers = {'Authorization': f'Bearer {self.credential.get_token(METRICS_SCOPE).token}'}
+        params = {
+            'metricnames': metric_name,
+            'starttime': start_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'endtime': end_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'interval': 'PT1H',
+            'aggregation': 'average',
+            'api-version': '2023-10-01'
+        }
+
+        def fetch(region, namespace, resource_ids):
+            response = self._session.post(
+                f'https://{region}.metrics.monitor.azure.com/subscriptions/{self.subscription_id}/metrics:getBatch',
+                params={**params, 'metricnamespace': namespace},
+                json={'resourceids': resource_ids},
+                headers=headers,
+                timeout=30
+            )
+            response.raise_for_status()
+            return response.json().get('values', [])
+
+        futures = [
+            self._executor.submit(fetch, region, namespace, ids[i:i + METRICS_BATCH_SIZE])
+            for (region, namespace), ids in groups.items()
+            for i in range(0, len(ids), METRICS_BATCH_SIZE)
+        ]
+
+        metrics = {}
+        for future in futures:
+            for resource in future.result():
+                points = metrics.setdefault(resource['resourceid'].lower(), [])
+                for metric in resource.get('value', []):
+                    for timeseries in metric.get('timeseries', []):
+                        points.extend(
+                            {'timestamp': datapoint['timeStamp'], 'value': datapoint['average'], 'unit': metric.get('unit')}
+                            for datapoint in timeseries.get('data', [])
+                            if datapoint.get('average') is not None
+                        )
+        return metrics
+
     def list_blobs(self, storage_account: str, container: str) -> Dict[str, Any]:
         """List all blobs in a container with detailed information.
         
@@ -648,31 +1102,29 @@ class AzureClient:
             # List blobs
             blobs = []
             try:
-                for blob in container_client.list_blobs():
-                    # Get blob client for additional properties
-                    blob_client = container_client.get_blob_client(blob.name)
-                    
-                    # Get blob properties
-                    properties = blob_client.get_blob_properties()
-                    
+                # The listing already carries each blob's properties, so no
+                # per-blob HEAD request is needed; read it a page at a time
+                pages = container_client.list_blobs(include=['metadata'], results_per_page=5000).by_page()
+                for blob in (b for page in pages for b in page):
                     blob_info = {
                         'name': blob.name,
-                        'size_bytes': properties.size,
-                        'content_type': properties.content_settings.content_type,
-                        'created_on': properties.creation_time.isoformat() if properties.creation_time else None,
-                        'last_modified': properties.last_modified.isoformat() if properties.last_modified else None,
-                        'blob_type': properties.blob_type,
-                        'lease_state': properties.lease.state if properties.lease else None,
+                        'size_bytes': blob.size,
+                        'content_type': blob.content_settings.content_type,
+                        'created_on': blob.creation_time.isoformat() if blob.creation_time else None,
+                        'last_modified': blob.last_modified.isoformat() if blob.last_modified else None,
+                        'blob_type': blob.blob_type,
+                        'lease_state': blob.lease.state if blob.lease else None,
                         'encryption': {
-                            'key_id': properties.encryption.key_id if properties.encryption else None,
-                            'algorithm': properties.encryption.algorithm if properties.encryption else None
+                            'key_id': blob.encryption_scope,
+                            # Storage service encryption is always AES-256
+                            'algorithm': 'AES256' if blob.server_encrypted else None
                         },
-                        'metadata': properties.metadata,
-                        'tags': properties.tag_count,
-                        'version_id': properties.version_id,
-                        'is_current_version': properties.is_current_version,
-                        'etag': properties.etag,
-                        'content_hash': properties.content_settings.content_md5
+                        'metadata': blob.metadata,
+                        'tags': blob.tag_count,
+                        'version_id': blob.version_id,
+                        'is_current_version': blob.is_current_version,
+                        'etag': blob.etag,
+                        'content_hash': blob.content_settings.content_md5
                     }
                     blobs.append(blob_info)
                     
@@ -711,6 +1163,20 @@ class AzureClient:
                 }
             }
             
+    @staticmethod
+    def _container_usage(container_client) -> Tuple[int, int]:
+        """Return (blob_count, total_size_bytes) for a container, or zeros if it can't be read."""
+        blob_count = 0
+        total_size = 0
+        try:
+            for page in container_client.list_blobs(results_per_page=5000).by_page():
+                for blob in page:
+                    blob_count += 1
+                    total_size += blob.size
+        except Exception:
+            pass  # Skip if can't access blobs
+        return blob_count, total_size
+
     def list_containers(self, storage_account: str) -> Dict[str, Any]:
         """List all containers in a storage account with detailed information.
         
@@ -738,23 +1204,16 @@ class AzureClient:
             # List containers
             containers = []
             try:
-                for container in blob_service.list_containers():
-                    # Get container client for properties
-                    container_client = blob_service.get_container_client(container.name)
-                    properties = container_client.get_container_properties()
-                    
-                    # Get blob count and size
-                    blob_count = 0
-                    total_size = 0
-                    try:
-                        for blob in container_client.list_blobs():
-                            blob_count += 1
-                            total_size += blob.size
-                    except Exception:
-                        pass  # Skip if can't access blobs
-                    
+                # The listing carries each container's properties; only the
+                # blob walks for count/size remain, and those run in parallel
+                listed = list(blob_service.list_containers(include_metadata=True))
+                usages = self._executor.map(
+                    lambda c: self._container_usage(blob_service.get_container_client(c.name)),
+                    listed
+                )
+                for properties, (blob_count, total_size) in zip(listed, usages):
                     container_info = {
-                        'name': container.name,
+                        'name': properties.name,
                         'last_modified': properties.last_modified.isoformat() if properties.last_modified else None,
                         'etag': properties.etag,
                         'lease_state': properties.lease.state if properties.lease else None,
@@ -982,7 +1441,7 @@ class AzureClient:
                     if metric_data["status"] == "success":
                         metrics_data[metric_name] = metric_data["data"]["metrics"]
                 except Exception as e:
-                    logger.warning(f'Error getting metric {metric_name} for VM {vm_name}: {str(e)}')
+                    logger.warning('Error getting metric %s for VM %s: %s', metric_name, vm_name, e)
                     metrics_data[metric_name] = []
             
             return {
@@ -1011,6 +1470,19 @@ class AzureClient:
                 }
             }
 
+    def iter_resource_groups(self) -> Iterator[Dict[str, Any]]:
+        """Yield the subscription's resource groups one at a time, page by page"""
+        for group in self.resource_client.resource_groups.list():
+            yield {
+                'id': group.id,
+                'name': group.name,
+                'location': group.location,
+                'tags': group.tags or {},
+                'provisioning_state': group.properties.provisioning_state,
+                'managed_by': group.managed_by
+            }
+
+    @ttl_cache(ttl=300, cache_if=succeeded)
     def list_resource_groups(self) -> Dict[str, Any]:
         """List all resource groups in the subscription with their properties.
         
@@ -1018,23 +1490,14 @@ class AzureClient:
             Dict containing resource groups and their properties.
         """
         try:
-            groups = list(self.resource_client.resource_groups.list())
-            if not groups:
+            result = list(self.iter_resource_groups())
+            if not result:
                 return {
                     "status": "empty",
                     "message": "No resource groups found in the subscription",
                     "data": []
                 }
             
-            result = [{
-                'id': group.id,
-                'name': group.name,
-                'location': group.location,
-                'tags': group.tags or {},
-                'provisioning_state': group.properties.provisioning_state,
-                'managed_by': group.managed_by
-            } for group in groups]
-            
             return {
                 "status": "success",
                 "message": "Resource groups retrieved successfully",
@@ -1049,13 +1512,3 @@ class AzureClient:
                 "error": str(e),
                 "data": []
             }
-            for group in self.resource_client.resource_groups.list():
-                groups.append({
-                    'name': group.name,
-                    'location': group.location,
-                    'provisioning_state': group.properties.provisioning_state,
-                    'tags': group.tags or {}
-                })
-            return groups
-        except Exception as e:
-            raise Exception(f'Error listing resource groups: {str(e)}')
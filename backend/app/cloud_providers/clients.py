@@ -0,0 +1,34 @@
+"""Shared cloud provider clients, constructed once on first use"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from app.config import config
+
+if TYPE_CHECKING:
+    from app.cloud_providers.aws_client import AWSClient
+    from app.cloud_providers.azure_client import AzureClient
+
+@lru_cache(maxsize=1)
+def get_aws_client() -> "AWSClient":
+    """Return the process-wide AWS client.
+
+    The SDK import is deferred until the first call; credentials are
+    verified separately at startup (see AWSClient.verify_credentials).
+    A failed construction is not cached, so the next call retries.
+    """
+    from app.cloud_providers.aws_client import AWSClient
+    return AWSClient(
+        aws_access_key_id=config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=config.AWS_SECRET_ACCESS_KEY,
+        region=config.AWS_DEFAULT_REGION
+    )
+
+@lru_cache(maxsize=1)
+def get_azure_client() -> "AzureClient":
+    """Return the process-wide Azure client.
+
+    The SDK import and subscription check are deferred until the first call.
+    A failed construction is not cached, so the next call retries.
+    """
+    from app.cloud_providers.azure_client import AzureClient
+    return AzureClient()
@@ -1,5 +1,6 @@
-from typing import Dict, List, Any
-from openai import OpenAI
+from typing import AsyncIterator, Dict, List, Any, Tuple
+from openai import AsyncOpenAI, OpenAI
+import json
 from .prompt_template import (
     SYSTEM_PROMPT,
     CLOUD_QUERY_TEMPLATE,
@@ -7,15 +8,21 @@ from .prompt_template import (
     COST_OPTIMIZATION_TEMPLATE
 )
 
+# Chat model and default sampling temperature for every completion, including
+# the ones queued through the Batch API
+MODEL = "gpt-4-turbo-preview"
+DEFAULT_TEMPERATURE = 0.7
+
 class LLMService:
     def __init__(self, api_key: str):
         self.client = OpenAI(api_key=api_key)
+        self.async_client = AsyncOpenAI(api_key=api_key)
 
-    def _get_completion(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> str:
+    def _get_completion(self, messages: List[Dict[str, str]], temperature: float = DEFAULT_TEMPERATURE) -> str:
         """Get completion from OpenAI API"""
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
+                model=MODEL,
                 messages=messages,
                 temperature=temperature
             )
@@ -23,84 +30,205 @@ class LLMService:
         except Exception as e:
             raise Exception(f'Error getting LLM completion: {str(e)}')
 
+    def embed_query(self, text: str) -> List[float]:
+        """Get an embedding vector for a user query"""
+        try:
+            response = self.client.embeddings.create(
+                model="text-embedding-3-small",
+                input=text
+            )
+            return response.data[0].embedding
+        except Exception as e:
+            raise Exception(f'Error getting query embedding: {str(e)}')
+
+    def _cloud_query_messages(self,
+                              user_query: str,
+                              available_platforms: List[str],
+                              current_context: Dict[str, Any] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a cloud management query"""
+        # Format the query template
+        formatted_query = CLOUD_QUERY_TEMPLATE.format(
+            user_query=user_query,
+            available_platforms=', '.join(available_platforms),
+            current_context=str(current_context or {})
+        )
+
+        # Prepare messages for the API
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": formatted_query}
+        ]
+
+    def _parse_cloud_query_response(self, response: str) -> Dict[str, Any]:
+        """Parse the model's sectioned reply into a structured command"""
+        lines = response.split('\n')
+        result = {
+            'platforms': [],
+            'resources': [],
+            'action': '',
+            'parameters': {}
+        }
+
+        current_section = ''
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            # Check for section headers
+            lower_line = line.lower()
+            if lower_line.startswith('platforms:'):
+                current_section = 'platforms'
+                continue
+            elif lower_line.startswith('resources:'):
+                current_section = 'resources'
+                continue
+            elif lower_line.startswith('action:'):
+                current_section = 'action'
+                continue
+            elif lower_line.startswith('parameters:'):
+                current_section = 'parameters'
+                continue
+
+            # Process content based on current section
+            if line.startswith('-'):
+                line = line[1:].strip()
+                if current_section == 'platforms':
+                    if line:
+                        result['platforms'].append(line)
+                elif current_section == 'resources':
+                    if line:
+                        result['resources'].append(line.lower())
+                elif current_section == 'action':
+                    if line:
+                        result['action'] = line
+                elif current_section == 'parameters':
+                    if ':' in line:
+                        key, value = [x.strip() for x in line.split(':', 1)]
+                        # Handle list values in square brackets
+                        if value.startswith('[') and value.endswith(']'):
+                            values = [x.strip().strip('"') for x in value[1:-1].split(',')]
+                            result['parameters'][key] = values
+                        else:
+                            result['parameters'][key] = value
+
+        return result
+
     def process_cloud_query(self, 
                           user_query: str, 
                           available_platforms: List[str],
-                          current_context: Dict[str, Any] = None) -> Dict[str, Any]:
+                          current_context: Dict[str, Any] = None,
+                          temperature: float = DEFAULT_TEMPERATURE) -> Dict[str, Any]:
         """Process a natural language cloud management query"""
         try:
-            # Format the query template
-            formatted_query = CLOUD_QUERY_TEMPLATE.format(
-                user_query=user_query,
-                available_platforms=', '.join(available_platforms),
-                current_context=str(current_context or {})
-            )
-
-            # Prepare messages for the API
-            messages = [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": formatted_query}
-            ]
+            messages = self._cloud_query_messages(user_query, available_platforms, current_context)
 
             # Get completion
-            response = self._get_completion(messages, temperature=0.7)
+            response = self._get_completion(messages, temperature=temperature)
 
             # Parse the response into structured format
-            lines = response.split('\n')
-            result = {
-                'platforms': [],
-                'resources': [],
-                'action': '',
-                'parameters': {}
-            }
+            return self._parse_cloud_query_response(response)
 
-            current_section = ''
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
+        except Exception as e:
+            raise Exception(f'Error processing cloud query: {str(e)}')
 
-                # Check for section headers
-                lower_line = line.lower()
-                if lower_line.startswith('platforms:'):
-                    current_section = 'platforms'
-                    continue
-                elif lower_line.startswith('resources:'):
-                    current_section = 'resources'
+    async def astream_process_cloud_query(self,
+                                          user_query: str,
+                                          available_platforms: List[str],
+                                          current_context: Dict[str, Any] = None,
+                                          temperature: float = DEFAULT_TEMPERATURE) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream the interpretation of a cloud query without blocking the event loop.
+
+        Yields ("delta", text) for each chunk of the reply as it arrives, then
+        ("command", parsed_command) once the reply is complete.
+        """
+        try:
+            stream = await self.async_client.chat.completions.create(
+                model=MODEL,
+                messages=self._cloud_query_messages(user_query, available_platforms, current_context),
+                temperature=temperature,
+                stream=True
+            )
+
+            parts = []
+            async for chunk in stream:
+                if not chunk.choices:
                     continue
-                elif lower_line.startswith('action:'):
-                    current_section = 'action'
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield "delta", delta
+        except Exception as e:
+            raise Exception(f'Error processing cloud query: {str(e)}')
+
+        yield "command", self._parse_cloud_query_response("".join(parts))
+
+    def submit_batch(self,
+                     queries: List[str],
+                     available_platforms: List[str],
+                     current_context: Dict[str, Any] = None,
+                     temperature: float = DEFAULT_TEMPERATURE) -> str:
+        """Submit cloud queries to the OpenAI Batch API and return the batch ID.
+
+        Batched requests cost half as much and draw on a separate rate-limit
+        pool, at the price of completing asynchronously (within 24 hours).
+        """
+        try:
+            lines = [
+                json.dumps({
+                    "custom_id": f"query-{i}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": MODEL,
+                        "messages": self._cloud_query_messages(query, available_platforms, current_context),
+                        "temperature": temperature
+                    }
+                })
+                for i, query in enumerate(queries)
+            ]
+            batch_file = self.client.files.create(
+                file=("queries.jsonl", "\n".join(lines).encode()),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            return batch.id
+        except Exception as e:
+            raise Exception(f'Error submitting batch: {str(e)}')
+
+    def get_batch_results(self, batch_id: str) -> Dict[str, Any]:
+        """Return a batch's status, plus the parsed commands once it has completed.
+
+        Results are ordered like the submitted queries; a query that failed
+        has None in its place.
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            result = {'batch_id': batch_id, 'status': batch.status}
+            if batch.status != 'completed' or not batch.output_file_id:
+                return result
+
+            parsed = {}
+            output = self.client.files.content(batch.output_file_id).text
+            for line in output.splitlines():
+                if not line.strip():
                     continue
-                elif lower_line.startswith('parameters:'):
-                    current_section = 'parameters'
+                item = json.loads(line)
+                response = item.get('response') or {}
+                if response.get('status_code') != 200:
                     continue
+                content = response['body']['choices'][0]['message']['content']
+                parsed[item['custom_id']] = self._parse_cloud_query_response(content)
 
-                # Process content based on current section
-                if line.startswith('-'):
-                    line = line[1:].strip()
-                    if current_section == 'platforms':
-                        if line:
-                            result['platforms'].append(line)
-                    elif current_section == 'resources':
-                        if line:
-                            result['resources'].append(line.lower())
-                    elif current_section == 'action':
-                        if line:
-                            result['action'] = line
-                    elif current_section == 'parameters':
-                        if ':' in line:
-                            key, value = [x.strip() for x in line.split(':', 1)]
-                            # Handle list values in square brackets
-                            if value.startswith('[') and value.endswith(']'):
-                                values = [x.strip().strip('"') for x in value[1:-1].split(',')]
-                                result['parameters'][key] = values
-                            else:
-                                result['parameters'][key] = value
-
+            total = batch.request_counts.total if batch.request_counts else len(parsed)
+            result['results'] = [parsed.get(f"query-{i}") for i in range(total)]
             return result
-
         except Exception as e:
-            raise Exception(f'Error processing cloud query: {str(e)}')
+            raise Exception(f'Error retrieving batch results: {str(e)}')
 
     def analyze_error(self, 
                      operation: str, 
@@ -121,7 +249,7 @@ class LLMService:
                 {"role": "user", "content": formatted_query}
             ]
 
-            response = self._get_completion(messages, temperature=0.7)
+            response = self._get_completion(messages, temperature=DEFAULT_TEMPERATURE)
             
             # Parse the response into sections
             sections = {
@@ -165,7 +293,7 @@ class LLMService:
                 {"role": "user", "content": formatted_query}
             ]
 
-            response = self._get_completion(messages, temperature=0.7)
+            response = self._get_completion(messages, temperature=DEFAULT_TEMPERATURE)
             
             # Parse the response into sections
             sections = {
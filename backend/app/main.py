@@ -1,6 +1,7 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.api.routes import query
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.include_router(query.router, prefix="/api")
@@ -0,0 +1,172 @@
+"""Small in-process caches for expensive cloud and LLM calls"""
+
+import copy
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+def succeeded(value: Any) -> bool:
+    """Whether a response is worth caching; `{"status": "error"}` dicts are not"""
+    return not (isinstance(value, dict) and value.get('status') == 'error')
+
+def ttl_cache(ttl: float, maxsize: int = 128, cache_if: Optional[Callable[[Any], bool]] = None):
+    """Memoize a function's return values for `ttl` seconds.
+
+    Arguments must be hashable. They are bound to the function's signature,
+    so positional and keyword spellings of the same call share an entry.
+    Exceptions are not cached, nor are values `cache_if` rejects. Values are
+    deep-copied on store and on hit so callers can't mutate the cached value.
+    The least recently used entry is evicted once `maxsize` entries are stored.
+    """
+    def decorator(func):
+        entries = OrderedDict()
+        lock = threading.Lock()
+        signature = inspect.signature(func)
+
+        def make_key(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(
+                (name, tuple(sorted(value.items())) if signature.parameters[name].kind is inspect.Parameter.VAR_KEYWORD else value)
+                for name, value in bound.arguments.items()
+            )
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and entry[0] > now:
+                    entries.move_to_end(key)
+                    return copy.deepcopy(entry[1])
+
+            value = func(*args, **kwargs)
+            if cache_if is not None and not cache_if(value):
+                return value
+
+            with lock:
+                entries[key] = (now + ttl, copy.deepcopy(value))
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return value
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+class LLMCache:
+    """Exact-match cache for deterministic LLM calls.
+
+    Entries are keyed on a SHA-256 of the call's inputs and expire after
+    `ttl` seconds. Hits return a deep copy so callers can't mutate the
+    cached value.
+    """
+
+    def __init__(self, ttl: float = 3600, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(**parts: Any) -> str:
+        """Build a stable cache key from the call's inputs"""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def cached_or_call(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, or call `fn` and cache its result"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self.misses += 1
+
+        value = fn()
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+class SemanticCache:
+    """Similarity cache for LLM results keyed on query embeddings.
+
+    Paraphrased queries miss an exact-match cache but usually produce the
+    same parsed command. A lookup returns the value stored for the most
+    similar earlier query if its cosine similarity reaches `threshold`.
+    Entries are partitioned by a context key so that, e.g., different date
+    ranges never share results. Search is a linear scan, which is cheap
+    next to an LLM round-trip at this cache size.
+    """
+
+    def __init__(self, threshold: float = 0.92, ttl: float = 3600, maxsize: int = 512):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: List[tuple] = []  # (expires_at, context_key, unit_vector, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> List[float]:
+        norm = sum(x * x for x in vector) ** 0.5 or 1.0
+        return [x / norm for x in vector]
+
+    def lookup(self, context_key: str, vector: Sequence[float]) -> Optional[Any]:
+        """Return a copy of the closest cached value, or None below the threshold"""
+        query = self._normalize(vector)
+        now = time.monotonic()
+        best_score, best_value = self.threshold, None
+        with self._lock:
+            self._entries = [e for e in self._entries if e[0] > now]
+            for _, key, unit, value in self._entries:
+                if key != context_key:
+                    continue
+                score = sum(a * b for a, b in zip(query, unit))
+                if score >= best_score:
+                    best_score, best_value = score, value
+            if best_value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return copy.deepcopy(best_value)
+
+    def add(self, context_key: str, vector: Sequence[float], value: Any):
+        entry = (time.monotonic() + self.ttl, context_key, self._normalize(vector), copy.deepcopy(value))
+        with self._lock:
+            self._entries.append(entry)
+            if len(self._entries) > self.maxsize:
+                del self._entries[:len(self._entries) - self.maxsize]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
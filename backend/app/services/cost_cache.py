@@ -0,0 +1,48 @@
+"""On-disk cache for billing API responses.
+
+Cost Explorer and Azure Cost Management bill per call and return the same
+data for a given window throughout the day, so responses are persisted as
+JSON files and reused across requests and restarts until they expire.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Hashable
+
+CACHE_DIR = Path(os.getenv('CLOUDWISE_CACHE_DIR', Path.home() / '.cache' / 'cloudwise'))
+
+def _cache_path(key: Hashable) -> Path:
+    digest = hashlib.sha256(repr(key).encode()).hexdigest()[:16]
+    return CACHE_DIR / f'costs-{digest}.json'
+
+def get_or_fetch(key: Hashable, fetch_fn: Callable[[], Any], ttl: float = 86400) -> Any:
+    """Return the cached response for ``key``, calling ``fetch_fn`` on a miss.
+
+    Entries older than ``ttl`` seconds are refetched. Empty results and
+    ``{"status": "error"}`` responses are not persisted, and a cache
+    directory that can't be read or written simply falls through to
+    ``fetch_fn``.
+    """
+    path = _cache_path(key)
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            with path.open() as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    result = fetch_fn()
+    if result and not (isinstance(result, dict) and result.get('status') == 'error'):
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first so readers never see a partial entry
+            tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+            with tmp_path.open('w') as f:
+                json.dump(result, f)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            pass
+    return result
@@ -0,0 +1,18 @@
+"""Day-granularity date windows for cost queries"""
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Tuple
+
+@lru_cache(maxsize=8)
+def _window(days: int, day_bucket: str) -> Tuple[str, str]:
+    end = date.fromisoformat(day_bucket)
+    return (end - timedelta(days=days)).isoformat(), end.isoformat()
+
+def date_window(days: int) -> Tuple[str, str]:
+    """Return (start_date, end_date) as YYYY-MM-DD strings covering the last `days` days.
+
+    Results are cached per calendar day, so the strings (and any cache keyed
+    on them) stay stable until the date rolls over.
+    """
+    return _window(days, date.today().isoformat())
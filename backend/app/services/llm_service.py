@@ -8,40 +8,43 @@ class LLMService:
         openai.api_key = api_key
         self.model = "gpt-4-turbo-preview"  # Using the latest GPT-4 model
 
+    def _cloud_query_messages(self, user_query: str, available_platforms: List[str], current_context: Dict[str, Any] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for interpreting a cloud query"""
+        prompt = self._construct_cloud_query_prompt(user_query, available_platforms, current_context)
+        return [
+            {"role": "system", "content": "You are a cloud infrastructure assistant that helps interpret natural language queries into structured commands for cloud resource management. Always return valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _parse_cloud_command(self, result: str) -> Dict[str, Any]:
+        """Parse the model's JSON command, falling back to an empty command"""
+        try:
+            # Try to parse as JSON
+            return json.loads(result)
+        except json.JSONDecodeError:
+            # If not valid JSON, provide a structured response
+            return {
+                "platforms": [],
+                "resources": [],
+                "action": "",
+                "parameters": {}
+            }
+
     def process_cloud_query(self, user_query: str, available_platforms: List[str], current_context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Process a natural language query about cloud resources"""
         try:
-            # Construct the prompt
-            prompt = self._construct_cloud_query_prompt(user_query, available_platforms, current_context)
-            
             # Get completion from OpenAI
             client = openai.OpenAI(api_key=openai.api_key)
             response = client.chat.completions.create(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a cloud infrastructure assistant that helps interpret natural language queries into structured commands for cloud resource management. Always return valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._cloud_query_messages(user_query, available_platforms, current_context),
                 temperature=0.1,  # Low temperature for more deterministic outputs
                 max_tokens=500,
                 response_format={"type": "json_object"}
             )
             
             # Parse the response
-            result = response.choices[0].message.content
-            try:
-                # Try to parse as JSON
-                parsed_result = json.loads(result)
-            except json.JSONDecodeError:
-                # If not valid JSON, provide a structured response
-                parsed_result = {
-                    "platforms": [],
-                    "resources": [],
-                    "action": "",
-                    "parameters": {}
-                }
-            
-            return parsed_result
+            return self._parse_cloud_command(response.choices[0].message.content)
 
         except Exception as e:
             raise Exception(f"Error getting LLM completion: {str(e)}")
@@ -0,0 +1,12 @@
+from collections import Counter
+
+from app import create_app
+
+def test_routes_registered_once():
+    app = create_app()
+    route_keys = Counter(
+        (method, route.path)
+        for route in app.routes
+        for method in (getattr(route, "methods", None) or {""})
+    )
+    assert [key for key, count in route_keys.items() if count > 1] == []
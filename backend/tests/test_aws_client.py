@@ -0,0 +1,84 @@
+import ast
+from collections import Counter
+from pathlib import Path
+
+from app.cloud_providers.aws_client import AWSClient, _flatten_reservations
+
+AWS_CLIENT_PATH = Path(__file__).resolve().parent.parent / "app" / "cloud_providers" / "aws_client.py"
+
+def test_aws_client_methods_defined_once():
+    tree = ast.parse(AWS_CLIENT_PATH.read_text())
+    aws_client = next(
+        node for node in tree.body
+        if isinstance(node, ast.ClassDef) and node.name == "AWSClient"
+    )
+    counts = Counter(
+        node.name for node in aws_client.body
+        if isinstance(node, ast.FunctionDef)
+    )
+    assert counts["get_cost_and_usage"] == 1
+    assert [name for name, count in counts.items() if count > 1] == []
+
+def test_flatten_reservations():
+    reservations = [
+        {"Instances": [
+            {
+                "InstanceId": "i-1",
+                "InstanceType": "t3.micro",
+                "State": {"Name": "running"},
+                "Tags": [{"Key": "Name", "Value": "web"}, {"Key": "env", "Value": "prod"}]
+            },
+            {"InstanceId": "i-2"}
+        ]},
+        {"Instances": [{"InstanceId": "i-3", "State": {"Name": "stopped"}}]}
+    ]
+    instances = _flatten_reservations(reservations, "eu-west-2")
+
+    assert [i["InstanceId"] for i in instances] == ["i-1", "i-2", "i-3"]
+    assert instances[0]["Name"] == "web"
+    assert instances[0]["State"] == "running"
+    assert instances[0]["Region"] == "eu-west-2"
+    assert instances[1]["InstanceType"] == "Unknown"
+    assert instances[1]["State"] == "Unknown"
+    assert instances[1]["Tags"] == []
+    assert "Name" not in instances[1]
+    assert "LaunchTime" not in instances[1]
+
+class _FakeCostExplorer:
+    def __init__(self, pages):
+        self.pages = list(pages)
+        self.requests = []
+
+    def get_cost_and_usage(self, **request):
+        self.requests.append(dict(request))
+        return self.pages.pop(0)
+
+def _cost_group(service, region, amount):
+    return {"Keys": [service, region], "Metrics": {"UnblendedCost": {"Amount": str(amount)}}}
+
+def test_get_cost_and_usage_aggregates_all_pages():
+    ce = _FakeCostExplorer([
+        {
+            "ResultsByTime": [{"TimePeriod": {"Start": "2024-01-01"}, "Groups": [
+                _cost_group("Amazon EC2", "us-east-1", 10),
+                _cost_group("AWS IAM", "", 0.5)
+            ]}],
+            "NextPageToken": "page-2"
+        },
+        {
+            "ResultsByTime": [{"TimePeriod": {"Start": "2024-02-01"}, "Groups": [
+                _cost_group("Amazon EC2", "eu-west-2", 4),
+                _cost_group("Amazon S3", "us-east-1", 1.5)
+            ]}]
+        }
+    ])
+    client = AWSClient.__new__(AWSClient)
+    client._clients = {("ce", "us-east-1"): ce}
+
+    result = client.get_cost_and_usage("2024-01-01", "2024-03-01")
+
+    assert ce.requests[1]["NextPageToken"] == "page-2"
+    assert result["totalCost"] == 16
+    assert result["costsByService"] == {"Amazon EC2": 14, "AWS IAM": 0.5, "Amazon S3": 1.5}
+    assert result["costsByLocation"] == {"us-east-1": 11.5, "global": 0.5, "eu-west-2": 4}
+    assert result["costsByPeriod"] == {"2024-01-01": 10.5, "2024-02-01": 5.5}
@@ -0,0 +1,115 @@
+import ast
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.cloud_providers.azure_client import AzureClient, _rg_from_id
+
+AZURE_CLIENT_PATH = Path(__file__).resolve().parent.parent / "app" / "cloud_providers" / "azure_client.py"
+
+def test_azure_client_methods_defined_once():
+    tree = ast.parse(AZURE_CLIENT_PATH.read_text())
+    classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+    assert [node.name for node in classes].count("AzureClient") == 1
+    azure_client = next(node for node in classes if node.name == "AzureClient")
+    counts = Counter(
+        node.name for node in azure_client.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    )
+    assert counts["list_resource_groups"] == 1
+    assert [name for name, count in counts.items() if count > 1] == []
+
+SUBSCRIPTION_ID = "00000000-0000-0000-0000-000000000000"
+
+def _bare_client():
+    client = AzureClient.__new__(AzureClient)
+    client.subscription_id = SUBSCRIPTION_ID
+    return client
+
+def test_rg_from_id():
+    assert _rg_from_id(
+        f"/subscriptions/{SUBSCRIPTION_ID}/resourceGroups/web-rg/providers/Microsoft.Compute/virtualMachines/vm1"
+    ) == "web-rg"
+    assert _rg_from_id(f"/subscriptions/{SUBSCRIPTION_ID}/resourceGroups/web-rg") == "web-rg"
+
+def test_get_cost_analysis_aggregates_rows():
+    client = _bare_client()
+    vm = f"/subscriptions/{SUBSCRIPTION_ID}/resourcegroups/rg/providers/microsoft.compute/virtualmachines/vm1"
+    disk = f"/subscriptions/{SUBSCRIPTION_ID}/resourcegroups/rg/providers/microsoft.compute/disks/d1"
+    columns = ["UsageDate", "ServiceName", "Cost", "ResourceLocation", "ResourceId", "Currency"]
+    rows = [
+        [20240101, "Virtual Machines", 6.0, "westeurope", vm, "EUR"],
+        [20240102, "Virtual Machines", 4.0, "westeurope", vm, "EUR"],
+        [20240101, "Storage", 1.0, "northeurope", disk, "EUR"],
+        [20240102, None, 0.5, None, None, "EUR"]
+    ]
+    client._query_costs = lambda scope, parameters: (columns, rows)
+
+    response = client.get_cost_analysis("LastWeek")
+
+    assert response["status"] == "success"
+    data = response["data"]
+    assert data["currency"] == "EUR"
+    assert data["totalCost"] == 11.5
+    assert data["costsByService"] == {"Virtual Machines": 10.0, "Storage": 1.0, "Unknown": 0.5}
+    assert data["costsByLocation"] == {"westeurope": 10.0, "northeurope": 1.0, "Unknown": 0.5}
+    assert data["costsByResource"][vm] == {"cost": 10.0, "service": "Virtual Machines", "location": "westeurope"}
+    assert data["dailyCosts"] == [{"date": "20240101", "cost": 7.0}, {"date": "20240102", "cost": 4.5}]
+
+class _FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def json(self):
+        return self.body
+
+    def raise_for_status(self):
+        pass
+
+class _FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.posted = None
+
+    def post(self, url, json, headers, timeout):
+        self.posted = json
+        return self.response
+
+    def get(self, url, headers, timeout):
+        return self.response
+
+def _with_batch_response(client, response):
+    client.credential = SimpleNamespace(get_token=lambda scope: SimpleNamespace(token="token"))
+    client._session = _FakeSession(response)
+    return client._session
+
+def test_vm_status_batch_maps_replies_by_name():
+    client = _bare_client()
+    session = _with_batch_response(client, _FakeResponse(200, {"responses": [
+        {"name": "1", "httpStatusCode": 404, "content": {"error": {"message": "VM not found"}}},
+        {"name": "0", "httpStatusCode": 200, "content": {
+            "statuses": [{"code": "PowerState/running", "level": "Info", "displayStatus": "VM running"}],
+            "maintenanceState": None
+        }}
+    ]}))
+
+    statuses = client._vm_status_batch([("rg", "vm1"), ("rg", "missing"), ("rg", "vm3")])
+
+    assert len(session.posted["requests"]) == 3
+    assert statuses[0]["vm_name"] == "vm1"
+    assert statuses[0]["statuses"] == [
+        {"code": "PowerState/running", "level": "Info", "display_status": "VM running", "message": None}
+    ]
+    assert statuses[1] == {"error": "VM not found"}
+    assert statuses[2] == {"error": "HTTP None"}
+
+def test_vm_status_batch_gives_up_on_pending_batches():
+    client = _bare_client()
+    _with_batch_response(client, _FakeResponse(202, headers={"Retry-After": "120.5", "Location": "poll"}))
+
+    with pytest.raises(TimeoutError):
+        client._vm_status_batch([("rg", "vm1")])
@@ -0,0 +1,116 @@
+from types import SimpleNamespace
+
+from app.services import cache
+from app.services.cache import LLMCache, SemanticCache, succeeded, ttl_cache
+
+def test_ttl_cache_binds_positional_keyword_and_default_calls():
+    calls = []
+
+    @ttl_cache(ttl=60)
+    def fetch(provider, timeframe="LastMonth"):
+        calls.append((provider, timeframe))
+        return {"provider": provider}
+
+    fetch("aws")
+    fetch("aws", "LastMonth")
+    fetch(provider="aws", timeframe="LastMonth")
+    assert calls == [("aws", "LastMonth")]
+
+    fetch("aws", "LastWeek")
+    assert len(calls) == 2
+
+def test_ttl_cache_returns_copies():
+    @ttl_cache(ttl=60)
+    def fetch():
+        return {"data": {}}
+
+    fetch()["data"]["injected"] = True
+    assert fetch() == {"data": {}}
+
+def test_ttl_cache_skips_values_rejected_by_cache_if():
+    calls = []
+
+    @ttl_cache(ttl=60, cache_if=succeeded)
+    def fetch():
+        calls.append(1)
+        return {"status": "error"}
+
+    fetch()
+    fetch()
+    assert len(calls) == 2
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    calls = []
+
+    @ttl_cache(ttl=60)
+    def fetch():
+        calls.append(1)
+        return len(calls)
+
+    assert fetch() == 1
+    now[0] += 59
+    assert fetch() == 1
+    now[0] += 2
+    assert fetch() == 2
+
+def test_ttl_cache_evicts_least_recently_used():
+    calls = []
+
+    @ttl_cache(ttl=60, maxsize=2)
+    def fetch(key):
+        calls.append(key)
+        return key
+
+    fetch("a")
+    fetch("b")
+    fetch("a")
+    fetch("c")  # evicts "b"
+    fetch("a")
+    fetch("b")
+    assert calls == ["a", "b", "c", "b"]
+
+def test_succeeded():
+    assert succeeded({"status": "success"})
+    assert succeeded([])
+    assert not succeeded({"status": "error"})
+
+def test_llm_cache_key_ignores_dict_order():
+    assert LLMCache.key(q="x", p=["AWS"]) == LLMCache.key(p=["AWS"], q="x")
+    assert LLMCache.key(q="x") != LLMCache.key(q="y")
+
+def test_llm_cache_counts_hits_and_returns_copies():
+    llm_cache = LLMCache(ttl=60)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return {"resources": ["ec2"]}
+
+    llm_cache.cached_or_call("k", fn)["resources"].append("s3")
+    assert llm_cache.cached_or_call("k", fn) == {"resources": ["ec2"]}
+    assert len(calls) == 1
+    assert llm_cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+def test_semantic_cache_threshold():
+    semantic = SemanticCache(threshold=0.9)
+    semantic.add("ctx", [1.0, 0.0], {"action": "list"})
+
+    assert semantic.lookup("ctx", [2.0, 0.1]) == {"action": "list"}
+    assert semantic.lookup("ctx", [1.0, 1.0]) is None
+    assert semantic.stats()["hits"] == 1
+    assert semantic.stats()["misses"] == 1
+
+def test_semantic_cache_partitions_by_context():
+    semantic = SemanticCache(threshold=0.9)
+    semantic.add("last-week", [1.0, 0.0], {"action": "list"})
+
+    assert semantic.lookup("last-month", [1.0, 0.0]) is None
+
+def test_semantic_cache_returns_copies():
+    semantic = SemanticCache(threshold=0.9)
+    semantic.add("ctx", [1.0, 0.0], {"resources": ["ec2"]})
+
+    semantic.lookup("ctx", [1.0, 0.0])["resources"].append("s3")
+    assert semantic.lookup("ctx", [1.0, 0.0]) == {"resources": ["ec2"]}
@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+
+from app.services import cost_cache
+from app.services.date_windows import date_window
+
+def test_get_or_fetch_persists_results(monkeypatch, tmp_path):
+    monkeypatch.setattr(cost_cache, "CACHE_DIR", tmp_path)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"totalCost": 12.5}
+
+    assert cost_cache.get_or_fetch(("aws", "2024-01-01"), fetch) == {"totalCost": 12.5}
+    assert cost_cache.get_or_fetch(("aws", "2024-01-01"), fetch) == {"totalCost": 12.5}
+    assert len(calls) == 1
+
+    cost_cache.get_or_fetch(("aws", "2024-01-02"), fetch)
+    assert len(calls) == 2
+
+def test_get_or_fetch_refetches_expired_entries(monkeypatch, tmp_path):
+    monkeypatch.setattr(cost_cache, "CACHE_DIR", tmp_path)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"totalCost": len(calls)}
+
+    cost_cache.get_or_fetch("key", fetch, ttl=0)
+    assert cost_cache.get_or_fetch("key", fetch, ttl=0) == {"totalCost": 2}
+
+def test_get_or_fetch_does_not_persist_errors_or_empty_results(monkeypatch, tmp_path):
+    monkeypatch.setattr(cost_cache, "CACHE_DIR", tmp_path)
+
+    for result in ({"status": "error", "message": "throttled"}, {}):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return result
+
+        cost_cache.get_or_fetch(repr(result), fetch)
+        cost_cache.get_or_fetch(repr(result), fetch)
+        assert len(calls) == 2
+    assert list(tmp_path.iterdir()) == []
+
+def test_date_window():
+    today = date.today()
+    assert date_window(7) == ((today - timedelta(days=7)).isoformat(), today.isoformat())
+    assert date_window(30)[0] == (today - timedelta(days=30)).isoformat()
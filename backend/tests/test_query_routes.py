@@ -0,0 +1,19 @@
+from app.api.routes.query import convert_to_aws_filters
+
+def test_convert_to_aws_filters():
+    filters = convert_to_aws_filters({
+        "instance-state-name": ["running", "", None, " "],
+        "tag:Name": "web",
+        "instance-type": 3,
+        "vpc-id": "  ",
+        "subnet-id": None,
+        "availability-zone": []
+    })
+    assert filters == [
+        {"Name": "instance-state-name", "Values": ["running"]},
+        {"Name": "tag:Name", "Values": ["web"]},
+        {"Name": "instance-type", "Values": ["3"]}
+    ]
+
+def test_convert_to_aws_filters_empty():
+    assert convert_to_aws_filters({}) == []